@@ -0,0 +1,348 @@
+import random
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # numpy нужен только для этого режима
+    np = None
+
+from memstats import memory
+from world import (
+    DEATH,
+    ENEMY_ANIMATION_TIME,
+    JUMP,
+    MAX_PLATFORMS,
+    PLATFORM_HEIGHT,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    MAX_ENEMIES,
+    TICK,
+    LevelGenerator,
+    Player,
+    WaveScheduler,
+)
+
+
+def round_rect(values):
+    # pygame.Rect округляет дробные координаты от нуля - делаем так же
+    return np.fix(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+class PlatformView:
+    # Платформа для отрисовки и политик: читает данные прямо из массивов
+    __slots__ = ("store", "slot", "generation")
+
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+        self.generation = store.generation[slot]
+
+    @property
+    def rect(self):
+        store, slot = self.store, self.slot
+        return pygame.Rect(
+            int(store.x[slot]), int(store.y[slot]), int(store.width[slot]), PLATFORM_HEIGHT
+        )
+
+    @property
+    def prev_pos(self):
+        return int(self.store.prev_x[self.slot]), int(self.store.prev_y[self.slot])
+
+    @property
+    def is_stepped_on(self):
+        return bool(self.store.stepped[self.slot])
+
+    def alive(self):
+        store, slot = self.store, self.slot
+        return bool(store.alive[slot]) and store.generation[slot] == self.generation
+
+
+class EnemyView:
+    __slots__ = ("store", "slot", "frames")
+
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+        self.frames = store.frames
+
+    @property
+    def rect(self):
+        store, slot = self.store, self.slot
+        width, height = store.frames.size
+        return pygame.Rect(int(store.x[slot]), int(store.y[slot]), width, height)
+
+    @property
+    def prev_pos(self):
+        return int(self.store.prev_x[self.slot]), int(self.store.prev_y[self.slot])
+
+    @property
+    def current_frame(self):
+        return int(self.store.frame[self.slot])
+
+
+class PlatformStore:
+    """Платформы в виде массивов: по элементу на слот, живые помечены в alive."""
+
+    def __init__(self, capacity, rng, np_rng):
+        self.rng = rng
+        self.np_rng = np_rng
+        self.x = np.zeros(capacity, np.int64)
+        self.y = np.zeros(capacity, np.int64)
+        self.width = np.zeros(capacity, np.int64)
+        self.prev_x = np.zeros(capacity, np.int64)
+        self.prev_y = np.zeros(capacity, np.int64)
+        self.speed = np.zeros(capacity, np.int64)
+        self.direction = np.zeros(capacity, np.int64)
+        self.move_counter = np.zeros(capacity, np.int64)
+        self.generation = np.zeros(capacity, np.int64)
+        self.moving = np.zeros(capacity, bool)
+        self.destroyable = np.zeros(capacity, bool)
+        self.stepped = np.zeros(capacity, bool)
+        self.alive = np.zeros(capacity, bool)
+        self.count = 0
+
+    def __iter__(self):
+        return (PlatformView(self, slot) for slot in np.flatnonzero(self.alive))
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, width, moving, destroyable=False):
+        free = np.flatnonzero(~self.alive)
+        if len(free) == 0:
+            return
+        slot = free[0]
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.prev_y[slot] = y
+        self.width[slot] = width
+        self.moving[slot] = moving
+        self.move_counter[slot] = self.rng.randint(0, 50)
+        self.direction[slot] = self.rng.choice([-1, 1])
+        self.speed[slot] = self.rng.randint(1, 2)
+        self.destroyable[slot] = destroyable
+        self.stepped[slot] = False
+        self.alive[slot] = True
+        self.generation[slot] += 1
+        self.count += 1
+
+    def topmost_y(self):
+        return int(self.y[self.alive].min())
+
+    def near(self, top, bottom):
+        # Кандидаты на приземление снизу вверх, как в world.PlatformGroup.near
+        slots = np.flatnonzero(self.alive & (self.y > top) & (self.y < bottom))
+        slots = slots[np.argsort(-self.y[slots], kind="stable")]
+        return [PlatformView(self, slot) for slot in slots]
+
+    def save_positions(self):
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+    def update(self, scroll, difficulty, player_rect):
+        alive = self.alive
+        moving = alive & self.moving
+        self.move_counter[moving] += 1
+        self.x[moving] = round_rect(
+            self.x[moving] + self.direction[moving] * self.speed[moving] * difficulty
+        )
+        turn = moving & (
+            (self.move_counter >= 100)
+            | (self.x < 0)
+            | (self.x + self.width > SCREEN_WIDTH)
+        )
+        self.direction[turn] *= -1
+        self.move_counter[turn] = 0
+        self.y[alive] = round_rect(self.y[alive] + scroll)
+        dead = alive & (self.y > SCREEN_HEIGHT)
+
+        overlap = (
+            alive
+            & (self.x < player_rect.right)
+            & (self.x + self.width > player_rect.left)
+            & (self.y < player_rect.bottom)
+            & (self.y + PLATFORM_HEIGHT > player_rect.top)
+        )
+        self.stepped |= self.destroyable & overlap
+        # Использованная платформа ломается с шансом 25%, когда с неё спрыгнули
+        breaking = np.flatnonzero(alive & self.stepped & ~overlap)
+        if len(breaking):
+            dead[breaking[self.np_rng.random(len(breaking)) < 0.25]] = True
+        alive &= ~dead
+        self.count = int(np.count_nonzero(alive))
+
+
+class EnemyStore:
+    def __init__(self, capacity, frames):
+        self.frames = frames
+        self.x = np.zeros(capacity, np.int64)
+        self.y = np.zeros(capacity, np.int64)
+        self.prev_x = np.zeros(capacity, np.int64)
+        self.prev_y = np.zeros(capacity, np.int64)
+        self.speed = np.zeros(capacity, np.float64)
+        self.frame = np.zeros(capacity, np.int64)
+        self.anim_time = np.zeros(capacity, np.float64)
+        self.alive = np.zeros(capacity, bool)
+        self.count = 0
+
+    def __iter__(self):
+        return (EnemyView(self, slot) for slot in np.flatnonzero(self.alive))
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, speed):
+        free = np.flatnonzero(~self.alive)
+        if len(free) == 0:
+            return
+        slot = free[0]
+        width, height = self.frames.size
+        self.x[slot] = self.prev_x[slot] = x - width // 2
+        self.y[slot] = self.prev_y[slot] = y - height // 2
+        self.speed[slot] = speed
+        self.frame[slot] = 0
+        self.anim_time[slot] = 0
+        self.alive[slot] = True
+        self.count += 1
+
+    def save_positions(self):
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+    def update(self, scroll, dt, difficulty):
+        alive = self.alive
+        self.anim_time[alive] += dt
+        advance = alive & (self.anim_time >= ENEMY_ANIMATION_TIME)
+        self.anim_time[advance] = 0
+        self.frame[advance] = (self.frame[advance] + 1) % len(self.frames)
+        self.x[alive] = round_rect(self.x[alive] - self.speed[alive] * difficulty)
+        self.y[alive] = round_rect(self.y[alive] + scroll)
+        alive &= self.x + self.frames.size[0] >= 0
+        self.count = int(np.count_nonzero(alive))
+
+    def collide(self, player):
+        # Сначала пересечение прямоугольников, маски - только для кандидатов
+        width, height = self.frames.size
+        rect = player.rect
+        hits = np.flatnonzero(
+            self.alive
+            & (self.x < rect.right)
+            & (self.x + width > rect.left)
+            & (self.y < rect.bottom)
+            & (self.y + height > rect.top)
+        )
+        for slot in hits:
+            mask = self.frames.mask(int(self.frame[slot]))
+            offset = (int(self.x[slot]) - rect.x, int(self.y[slot]) - rect.y)
+            if player.mask.overlap(mask, offset):
+                return True
+        return False
+
+
+class ArrayWorld:
+    """Вариант world.World, где платформы и враги хранятся в массивах NumPy.
+
+    Движение, прокрутка, удаление и поломка платформ считаются векторно сразу
+    для всех объектов, поэтому режим рассчитан на "хаос"-конфигурации с
+    тысячами платформ. Спрайты-представления создаются только при чтении
+    platform_group/enemy_group (отрисовка, политики). Случайные числа
+    расходуются в другом порядке, чем в World, поэтому при одном и том же
+    seed игры не совпадают с World, но повторяются между запусками ArrayWorld.
+    """
+
+    def __init__(
+        self,
+        player_frames,
+        enemy_frames,
+        high_score=0,
+        difficulty=1.0,
+        max_platforms=MAX_PLATFORMS,
+        max_enemies=MAX_ENEMIES,
+        seed=None,
+    ):
+        if np is None:
+            raise ImportError("ArrayWorld требует numpy (pip install numpy)")
+        self.enemy_frames = enemy_frames
+        self.high_score = high_score
+        self.difficulty = difficulty
+        self.max_platforms = max_platforms
+        self.max_enemies = max_enemies
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        memory.track("world", self)
+        self.platforms = PlatformStore(
+            max_platforms, self.rng, np.random.default_rng(seed)
+        )
+        self.enemies = EnemyStore(max(max_enemies, 1), enemy_frames)
+        self.waves = WaveScheduler(self.rng, difficulty, max_enemies)
+        self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150, player_frames)
+        self.platforms.spawn(SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT - 50, 100, False)
+        self.level = LevelGenerator(seed, difficulty, (SCREEN_WIDTH // 2 - 50, 100))
+        self.scroll = 0
+        self.bg_scroll = 0
+        self.prev_bg_scroll = 0
+        self.score = 0
+        self.game_over = False
+        self.ticks = 0
+
+    @property
+    def platform_group(self):
+        return list(self.platforms)
+
+    @property
+    def enemy_group(self):
+        return list(self.enemies)
+
+    def spawn_platform(self):
+        p_x, p_w, gap, movable, p_destroyable = self.level.next_platform()
+        p_y = self.platforms.topmost_y() - gap
+        p_moving = movable and self.score > 1000
+        self.platforms.spawn(p_x, p_y, p_w, p_moving, destroyable=p_destroyable)
+
+    def spawn_enemy(self, x, y):
+        self.enemies.spawn(x, y, 2 * self.difficulty)
+
+    def save_positions(self):
+        self.prev_bg_scroll = self.bg_scroll
+        self.player.prev_pos = self.player.rect.topleft
+        self.platforms.save_positions()
+        self.enemies.save_positions()
+
+    def step(self, inputs):
+        events = []
+        if self.game_over:
+            return events
+        difficulty = self.difficulty
+        player = self.player
+        self.save_positions()
+
+        scroll, jumped = player.move(inputs, self.platforms, difficulty)
+        if jumped:
+            events.append(JUMP)
+        player.update()
+        self.scroll = scroll
+        self.bg_scroll += scroll * difficulty
+        if self.bg_scroll >= SCREEN_HEIGHT:
+            self.bg_scroll = 0
+
+        if len(self.platforms) < self.max_platforms:
+            self.spawn_platform()
+        self.platforms.update(scroll * difficulty, difficulty, player.rect)
+
+        for x, y in self.waves.next_wave(self.score, len(self.enemies)):
+            self.spawn_enemy(x, y)
+        self.enemies.update(scroll * difficulty, TICK, difficulty)
+
+        if scroll > 0:
+            self.score += scroll * difficulty
+
+        if player.rect.top > SCREEN_HEIGHT:
+            self.game_over = True
+            events.append(DEATH)
+        if self.enemies.collide(player):
+            self.game_over = True
+            events.append(DEATH)
+        self.ticks += 1
+        return events
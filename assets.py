@@ -0,0 +1,204 @@
+import os
+from collections import OrderedDict
+
+import pygame
+
+from spritesheet import SheetLayout, SpriteSheet
+from world import PLATFORM_HEIGHT, PLAYER_SIZE
+
+BIRD_SCALE = 3  # кадр 32x32 на экране 96x96
+PLATFORM_WIDTHS = range(40, 61)  # ширины, которые выдаёт спавнер
+INITIAL_PLATFORM_WIDTH = 100
+OPAQUE_IMAGES = {"background"}  # без прозрачности: convert(), блит - простое копирование
+COLORKEY = (0, 0, 0)
+
+IMAGES = {
+    "icon": r"assets\ghost.png",
+    "player": r"assets\bocchi1.png",
+    "background": r"assets\background2.png",
+    "platform": r"assets\wood.png",
+    "platform_broken": r"assets\wood2.png",
+    "bird": r"assets\bird.png",
+}
+# Раскладка кадров у изображений-листов
+SHEETS = {
+    "bird": SheetLayout((32, 32)),  # 288x32: 9 кадров в ряд
+}
+
+
+def path_gen(path):
+    # Пути в коде записаны через "\", собираем их под текущую ОС
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), *path.split("\\"))
+
+
+def decode_image(name):
+    # Только чтение и декодирование - годится для фонового потока
+    return pygame.image.load(path_gen(IMAGES[name]))
+
+
+class AssetRegistry:
+    """Загружает каждое изображение один раз и кэширует его варианты.
+
+    Варианты (масштабированные, отражённые) лежат в LRU по ключу (имя,
+    размер, отражение), поэтому повторные запросы не трогают ни диск, ни
+    transform. Листы из SHEETS создаются по одному на изображение, кадры они
+    кэшируют сами (spritesheet.SpriteSheet).
+    """
+
+    def __init__(self, max_variants=128):
+        self.max_variants = max_variants
+        self.images = {}
+        self.sheets = {}
+        self.variants = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, name):
+        image = self.images.get(name)
+        if image is None:
+            image = self.add(name, decode_image(name))
+        return image
+
+    def add(self, name, image):
+        # Изображение, декодированное в другом месте (см. loader.AssetLoader)
+        if name in OPAQUE_IMAGES:
+            image = image.convert()
+        else:
+            image = image.convert_alpha()
+        self.images[name] = image
+        return image
+
+    def lookup(self, key):
+        image = self.variants.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.variants.move_to_end(key)
+        return image
+
+    def store(self, key, image):
+        self.variants[key] = image
+        if len(self.variants) > self.max_variants:
+            self.variants.popitem(last=False)
+        return image
+
+    def get(self, name, size=None, flip=False):
+        key = (name, size, flip)
+        image = self.lookup(key)
+        if image is not None:
+            return image
+        image = self.image(name)
+        if size is not None and size != image.get_size():
+            image = pygame.transform.scale(image, size)
+        if flip:
+            image = pygame.transform.flip(image, True, False)
+        return self.store(key, image)
+
+    def sheet(self, name):
+        sheet = self.sheets.get(name)
+        if sheet is None:
+            sheet = SpriteSheet(self.image(name), SHEETS[name])
+            self.sheets[name] = sheet
+        return sheet
+
+    def surfaces(self, name):
+        # Всё, что получено из изображения name: оригинал, варианты, кадры листа
+        surfaces = [self.images.get(name)]
+        surfaces += [image for key, image in self.variants.items() if key[0] == name]
+        sheet = self.sheets.get(name)
+        if sheet is not None:
+            for frames in sheet.scaled.values():
+                surfaces += frames
+        return surfaces
+
+    def stats(self):
+        return {
+            "images": len(self.images),
+            "sheets": len(self.sheets),
+            "variants": len(self.variants),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def player_surface(registry, flip=False):
+    return registry.get("player", (PLAYER_SIZE, PLAYER_SIZE), flip)
+
+
+def platform_surface(registry, width, broken=False):
+    name = "platform_broken" if broken else "platform"
+    return registry.get(name, (width, PLATFORM_HEIGHT))
+
+
+def bird_surface(registry, frame):
+    return registry.sheet("bird").frames(BIRD_SCALE)[frame]
+
+
+def keyed(image, key=COLORKEY):
+    # Спрайт с прозрачностью "всё или ничего": colorkey и RLE вместо альфа-канала.
+    # Как и у исходного кадра с colorkey, пиксели цвета key прозрачны.
+    surf = pygame.Surface(image.get_size()).convert()
+    surf.fill(key)
+    surf.blit(image, (0, 0))
+    surf.set_colorkey(key, pygame.RLEACCEL)
+    return surf
+
+
+def preload(registry):
+    # Прогреваем всё, что понадобится в игре, чтобы спавн не масштабировал
+    for name in IMAGES:
+        registry.image(name)
+    for flip in (False, True):
+        player_surface(registry, flip)
+    for width in [*PLATFORM_WIDTHS, INITIAL_PLATFORM_WIDTH]:
+        platform_surface(registry, width)
+        platform_surface(registry, width, broken=True)
+    registry.sheet("bird").frames(BIRD_SCALE)
+
+
+class SpriteFrames:
+    """Кадры спрайта, их отражения и маски, посчитанные один раз при загрузке.
+
+    Таблицы индексируются как [flip][frame], поэтому смена кадра или
+    направления в игре - это просто выборка из кортежа. Маски строятся по
+    shapes, если форма для столкновений задана отдельно от картинок.
+    """
+
+    def __init__(self, images, flipped=None, shapes=None):
+        self.images = (tuple(images), tuple(flipped or map(mirror, images)))
+        if shapes is None:
+            shape_rows = self.images
+        else:
+            shape_rows = (shapes, map(mirror, shapes))
+        self.masks = tuple(
+            tuple(pygame.mask.from_surface(image) for image in row)
+            for row in shape_rows
+        )
+        self.size = self.images[0][0].get_size()
+
+    def __len__(self):
+        return len(self.images[0])
+
+    def image(self, frame=0, flip=False):
+        return self.images[flip][frame]
+
+    def mask(self, frame=0, flip=False):
+        return self.masks[flip][frame]
+
+
+def mirror(image):
+    return pygame.transform.flip(image, True, False)
+
+
+def player_frames(registry):
+    return SpriteFrames(
+        [player_surface(registry)], [player_surface(registry, flip=True)]
+    )
+
+
+def bird_frames(registry):
+    # Рисуются кадры с colorkey, а маски - по альфа-каналу кадров листа.
+    # Таблица одна на игру: птицы при спавне ничего не режут и не масштабируют
+    frames = registry.sheet("bird").frames(BIRD_SCALE)
+    return SpriteFrames([keyed(frame) for frame in frames], shapes=frames)
@@ -0,0 +1,98 @@
+import hashlib
+import os
+
+import pygame
+
+from assets import path_gen
+from storage import write_atomic
+
+CACHE_DIR = r"cache\audio"
+
+STEAL_OLDEST = "oldest"  # все голоса заняты - новый звук обрывает самый старый
+STEAL_NONE = "none"  # все голоса заняты - новый звук пропускается
+
+
+def cache_key(data):
+    # PCM зависит и от файла, и от формата микшера (частота, биты, каналы)
+    digest = hashlib.sha1(data)
+    digest.update(repr(pygame.mixer.get_init()).encode())
+    return digest.hexdigest()
+
+
+def load_sound(path, cache_dir=CACHE_DIR):
+    """Звук из файла через дисковый кэш декодированного PCM.
+
+    При первом запуске MP3 декодируется как обычно, а сырые сэмплы
+    сохраняются в cache_dir под хэшем исходного файла. Дальше звук
+    собирается из готового буфера без декодирования. Кэш только ускоряет
+    загрузку: если он недоступен, звук просто декодируется.
+    """
+    with open(path_gen(path), "rb") as file:
+        data = file.read()
+    cache_path = os.path.join(path_gen(cache_dir), cache_key(data) + ".pcm")
+    try:
+        with open(cache_path, "rb") as file:
+            return pygame.mixer.Sound(buffer=file.read())
+    except OSError:
+        pass
+    sound = pygame.mixer.Sound(path_gen(path))
+    try:
+        write_atomic(cache_path, sound.get_raw())
+    except OSError:
+        pass
+    return sound
+
+
+class ChannelGroup:
+    """Каналы микшера, зарезервированные под одну категорию звуков.
+
+    Число каналов - предел одновременных голосов категории. Звуки других
+    категорий эти каналы не займут, а при переполнении действует политика
+    steal.
+    """
+
+    def __init__(self, name, channels, steal=STEAL_OLDEST):
+        self.name = name
+        self.channels = channels
+        self.steal = steal
+        self.started = [0] * len(channels)  # номер запуска на каждом канале
+        self.plays = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def play(self, sound):
+        index = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                index = i
+                break
+        if index is None:
+            if self.steal == STEAL_NONE:
+                self.dropped += 1
+                return None
+            index = self.started.index(min(self.started))
+            self.stolen += 1
+        self.plays += 1
+        self.started[index] = self.plays
+        channel = self.channels[index]
+        channel.play(sound)
+        return channel
+
+
+def reserve_channels(categories):
+    """Раскладывает первые каналы микшера по категориям.
+
+    categories - {имя: (голосов, политика)}. Зарезервированные каналы
+    pygame не отдаёт Sound.play(), поэтому остальные звуки их не отнимут.
+    """
+    total = sum(voices for voices, _ in categories.values())
+    if pygame.mixer.get_num_channels() < total:
+        pygame.mixer.set_num_channels(total)
+    pygame.mixer.set_reserved(total)
+    groups = {}
+    first = 0
+    for name, (voices, steal) in categories.items():
+        channels = [pygame.mixer.Channel(i) for i in range(first, first + voices)]
+        groups[name] = ChannelGroup(name, channels, steal)
+        first += voices
+    return groups
@@ -0,0 +1,75 @@
+# Инициализация звуков: декодирование MP3 против дискового кэша PCM
+# (холодный запуск - кэша нет, тёплый - кэш есть), плюс проверка, что серия
+# прыжков не занимает канал звука смерти.
+#
+#   python -m benchmarks.audio_init --runs 20
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import audio
+from assets import path_gen
+
+SOUNDS = (r"assets\jump.mp3", r"assets\death.mp3")
+
+
+def timed(load):
+    start = time.perf_counter()
+    for path in SOUNDS:
+        load(path)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(runs):
+    decode, cold, warm = [], [], []
+    for _ in range(runs):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            decode.append(timed(lambda path: pygame.mixer.Sound(path_gen(path))))
+            cold.append(timed(lambda path: audio.load_sound(path, cache_dir)))
+            warm.append(timed(lambda path: audio.load_sound(path, cache_dir)))
+        finally:
+            shutil.rmtree(cache_dir)
+    for name, values in (("decode", decode), ("cold", cold), ("warm", warm)):
+        print(
+            f"{name:7} median {statistics.median(values):7.2f} ms, "
+            f"min {min(values):7.2f} ms"
+        )
+
+
+def bounce_storm(bounces):
+    groups = audio.reserve_channels(
+        {"jump": (2, audio.STEAL_OLDEST), "death": (1, audio.STEAL_OLDEST)}
+    )
+    jump = audio.load_sound(SOUNDS[0])
+    death = audio.load_sound(SOUNDS[1])
+    for _ in range(bounces):
+        groups["jump"].play(jump)
+        jump.play()  # и звуки без категории поверх
+    channel = groups["death"].play(death)
+    jumps = groups["jump"]
+    print(
+        f"{bounces} прыжков: {jumps.plays} запусков, {jumps.stolen} оборвано; "
+        f"смерть {'звучит' if channel and channel.get_busy() else 'НЕ звучит'}"
+    )
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Холодная и тёплая загрузка звуков")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--bounces", type=int, default=50)
+    args = parser.parse_args()
+    pygame.mixer.init()
+    measure(args.runs)
+    bounce_storm(args.bounces)
+
+
+if __name__ == "__main__":
+    run()
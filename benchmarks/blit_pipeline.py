@@ -0,0 +1,107 @@
+# Стоимость отрисовки кадра: прежний путь (фон с альфа-каналом, птица с
+# альфой, блит на каждый спрайт) против текущего (фон через convert(),
+# птица с colorkey и RLE, все спрайты одним blits). Сначала проверяется, что
+# оба пути рисуют одинаковые пиксели.
+#
+#   python -m benchmarks.blit_pipeline
+import argparse
+import time
+
+import pygame
+
+import assets
+import headless
+import render
+from world import SCREEN_HEIGHT, SCREEN_WIDTH, World
+
+SCENARIOS = {
+    "default": {},
+    "enemies": {"max_enemies": 3},
+    "crowded": {"max_platforms": 60, "max_enemies": 8},
+}
+
+
+class LegacyRenderer(render.Renderer):
+    def __init__(self, screen, registry, font):
+        super().__init__(screen, registry, font)
+        self.bg_image = registry.image("background").convert_alpha()
+
+    def enemy_blits(self, enemy_group, alpha=1.0):
+        return [
+            (
+                assets.bird_surface(self.registry, enemy.current_frame),
+                render.lerp_pos(enemy, alpha),
+            )
+            for enemy in enemy_group
+        ]
+
+    def draw_sprites(self, world, alpha=1.0):
+        blits = self.platform_blits(world.platform_group, alpha)
+        blits += self.enemy_blits(world.enemy_group, alpha)
+        blits.append(self.player_blit(world.player, alpha))
+        return [self.screen.blit(image, pos) for image, pos in blits]
+
+
+def worlds(sprites, options, count, seed):
+    # Набор состояний игры: враги появляются сразу, счёт выставлен за 2000
+    world = World(*sprites, seed=seed, **options)
+    world.score = 2001
+    policy = headless.GreedyPolicy()
+    for _ in range(count):
+        if world.game_over:
+            seed += 1
+            world = World(*sprites, seed=seed, **options)
+            world.score = 2001
+            policy = headless.GreedyPolicy()
+        world.step(policy(world))
+        yield world
+
+
+def measure(renderer, sprites, options, frames, seed):
+    total = 0.0
+    for world in worlds(sprites, options, frames, seed):
+        start = time.perf_counter()
+        renderer.draw(world, 0.5)
+        total += time.perf_counter() - start
+    return total / frames * 1000
+
+
+def same_pixels(screen, renderers, sprites, options, seed):
+    for world in worlds(sprites, options, 200, seed):
+        shots = []
+        for renderer in renderers:
+            renderer.draw(world, 0.5)
+            shots.append(pygame.image.tobytes(screen, "RGB"))
+        if shots[0] != shots[1]:
+            return False
+    return True
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Старый и новый путь отрисовки")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    screen = headless.init_display((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.font.init()
+    registry = assets.AssetRegistry()
+    assets.preload(registry)
+    font = pygame.font.SysFont("Lucida Sans", 20)
+    sprites = headless.load_frames(registry)
+    legacy = LegacyRenderer(screen, registry, font)
+    batched = render.Renderer(screen, registry, font)
+
+    print(f"{'scenario':10} {'legacy ms':>10} {'batched ms':>11} {'speedup':>8}  pixels")
+    for name, options in SCENARIOS.items():
+        same = same_pixels(screen, (legacy, batched), sprites, options, args.seed)
+        old = measure(legacy, sprites, options, args.frames, args.seed)
+        new = measure(batched, sprites, options, args.frames, args.seed)
+        print(
+            f"{name:10} {old:>10.3f} {new:>11.3f} {old / new:>7.2f}x  "
+            f"{'same' if same else 'DIFFER'}"
+        )
+
+
+if __name__ == "__main__":
+    run()
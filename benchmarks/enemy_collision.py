@@ -0,0 +1,89 @@
+# Стоимость проверки столкновения игрока с птицами за тик: прежний
+# spritecollide(..., collide_mask) по всем птицам против world.EnemyGroup
+# (полоса по y из индекса, затем прямоугольники, затем маски). Птицы
+# расставлены по всему экрану, игрок ходит по случайным местам; результаты
+# обоих способов сверяются на каждом шаге. Для сравнения выводится и время
+# целого тика World.step с тем же числом птиц (пока игрока не собьют).
+#
+#   python -m benchmarks.enemy_collision --enemies 1 --enemies 100 --enemies 500
+import argparse
+import random
+import time
+
+import pygame
+
+import headless
+from world import NO_INPUT, SCREEN_HEIGHT, SCREEN_WIDTH, World
+
+COUNTS = (1, 10, 100, 300, 1000)
+
+
+def crowded_world(sprites, count, seed):
+    rng = random.Random(seed)
+    world = World(*sprites, max_enemies=count, seed=seed)
+    height = world.enemy_frames.size[1]
+    for _ in range(count):
+        world.spawn_enemy(
+            rng.randint(0, SCREEN_WIDTH), rng.randint(height, SCREEN_HEIGHT - height)
+        )
+    return world, rng
+
+
+def measure(sprites, count, ticks, seed):
+    world, rng = crowded_world(sprites, count, seed)
+    player = world.player
+    group = world.enemy_group
+    height = world.enemy_frames.size[1]
+    old_total = new_total = 0.0
+    hits = 0
+    for _ in range(ticks):
+        player.rect.topleft = (
+            rng.randint(0, SCREEN_WIDTH - player.rect.width),
+            rng.randint(0, SCREEN_HEIGHT - player.rect.height),
+        )
+        start = time.perf_counter()
+        old = pygame.sprite.spritecollide(
+            player, group, False, pygame.sprite.collide_mask
+        )
+        old_total += time.perf_counter() - start
+        start = time.perf_counter()
+        new = group.collide(player, height)
+        new_total += time.perf_counter() - start
+        if bool(old) != (new is not None):
+            raise AssertionError(f"разные результаты при {count} птицах")
+        hits += new is not None
+    checks = group.mask_checks / ticks
+
+    # Целый тик с теми же птицами; игрок в безопасном месте над платформой
+    world, _ = crowded_world(sprites, count, seed)
+    start = time.perf_counter()
+    steps = 0
+    while steps < ticks and not world.game_over:
+        world.step(NO_INPUT)
+        steps += 1
+    step_us = (time.perf_counter() - start) / max(steps, 1) * 1e6
+    return old_total / ticks * 1e6, new_total / ticks * 1e6, checks, hits, step_us
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Столкновения с птицами")
+    parser.add_argument("--enemies", type=int, action="append")
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    sprites = headless.load_frames()
+
+    print(
+        f"{'enemies':>7} {'mask all us':>12} {'broadphase us':>14} "
+        f"{'masks/tick':>11} {'hits':>6} {'step us':>9}"
+    )
+    for count in args.enemies or COUNTS:
+        old, new, checks, hits, step = measure(sprites, count, args.ticks, args.seed)
+        print(
+            f"{count:>7} {old:>12.1f} {new:>14.1f} {checks:>11.2f} "
+            f"{hits:>6} {step:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    run()
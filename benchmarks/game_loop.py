@@ -0,0 +1,176 @@
+# Время кадра игры без окна: тик World и отрисовка Renderer, как в
+# main.GameScene, с вводом от headless.GreedyPolicy. Для каждого сценария
+# выводит p50/p95/p99 времени кадра, FPS и аллокации на кадр, по --json
+# сохраняет результат для сравнения между коммитами.
+#
+#   python -m benchmarks.game_loop --json bench.json
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+import assets
+import headless
+import render
+from world import SCREEN_HEIGHT, SCREEN_WIDTH, World
+
+# Счёт выставляется в начале игры: выше 1000 появляются движущиеся
+# платформы, выше 2000 - враги
+SCENARIOS = {
+    "default": {},
+    "moving": {"score": 1001},
+    "enemies": {"score": 2001},
+    "hard": {"difficulty": 3.0, "score": 2001},
+    "crowded": {"score": 2001, "max_platforms": 60, "max_enemies": 8},
+}
+
+
+class Game:
+    # Один сценарий: после смерти игра начинается заново со следующим seed
+    def __init__(self, sprites, options, seed):
+        self.sprites = sprites  # кадры игрока и врага
+        self.options = dict(options)
+        self.score = self.options.pop("score", 0)
+        self.seed = seed
+        self.restarts = 0
+        self.new_world()
+
+    def new_world(self):
+        self.world = World(
+            *self.sprites, seed=self.seed + self.restarts, **self.options
+        )
+        self.world.score = self.score
+        self.policy = headless.GreedyPolicy()
+        self.restarts += 1
+
+    def frame(self, renderer):
+        world = self.world
+        if world.game_over:
+            self.new_world()
+            world = self.world
+            renderer.invalidate()
+        world.step(self.policy(world))
+        renderer.draw(world)
+        renderer.present()
+
+
+def measure(game, renderer, frames):
+    times = []
+    perf_counter = time.perf_counter
+    gen0 = gc.get_stats()[0]["collections"]
+    for _ in range(frames):
+        start = perf_counter()
+        game.frame(renderer)
+        times.append(perf_counter() - start)
+    return times, gc.get_stats()[0]["collections"] - gen0
+
+
+def measure_allocations(game, renderer, frames):
+    # Отдельный проход: tracemalloc сильно замедляет кадр
+    tracemalloc.start()
+    peaks = []
+    for _ in range(frames):
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        else:  # Python 3.8: пик сбрасывается только перезапуском трассировки
+            tracemalloc.stop()
+            tracemalloc.start()
+        current, _ = tracemalloc.get_traced_memory()
+        game.frame(renderer)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    return statistics.mean(peaks)
+
+
+def run_scenario(options, sprites, renderer, frames, warmup, seed):
+    game = Game(sprites, options, seed)
+    for _ in range(warmup):
+        game.frame(renderer)
+    times, collections = measure(game, renderer, frames)
+    alloc = measure_allocations(game, renderer, min(frames, 300))
+    q = statistics.quantiles(times, n=100)
+    return {
+        "frames": frames,
+        "restarts": game.restarts - 1,
+        "p50_ms": q[49] * 1000,
+        "p95_ms": q[94] * 1000,
+        "p99_ms": q[98] * 1000,
+        "fps": frames / sum(times),
+        "alloc_peak_kib_per_frame": alloc / 1024,
+        "gen0_gc_per_1000_frames": collections * 1000 / frames,
+        "pixels_per_frame": renderer.total_pixels / max(renderer.frames, 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время кадра по сценариям")
+    parser.add_argument("--frames", type=int, default=1200)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dirty", action="store_true", help="dirty-режим Renderer")
+    parser.add_argument(
+        "--scenario", action="append", choices=SCENARIOS, help="по умолчанию все"
+    )
+    parser.add_argument("--json", help="куда записать результаты")
+    args = parser.parse_args()
+
+    screen = headless.init_display((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.font.init()
+    registry = assets.AssetRegistry()
+    assets.preload(registry)
+    font = pygame.font.SysFont("Lucida Sans", 20)
+    sprites = headless.load_frames(registry)
+
+    results = {}
+    print(
+        f"{'scenario':10} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'fps':>7} "
+        f"{'KiB/fr':>7} {'gc0/1k':>7}"
+    )
+    for name in args.scenario or SCENARIOS:
+        renderer = render.Renderer(screen, registry, font, dirty=args.dirty)
+        result = run_scenario(
+            SCENARIOS[name], sprites, renderer, args.frames, args.warmup, args.seed
+        )
+        results[name] = result
+        print(
+            f"{name:10} {result['p50_ms']:>7.3f} {result['p95_ms']:>7.3f} "
+            f"{result['p99_ms']:>7.3f} {result['fps']:>7.0f} "
+            f"{result['alloc_peak_kib_per_frame']:>7.1f} "
+            f"{result['gen0_gc_per_1000_frames']:>7.1f}"
+        )
+    if args.json:
+        report = {
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "dirty": args.dirty,
+            "seed": args.seed,
+            "scenarios": results,
+        }
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
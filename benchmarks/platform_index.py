@@ -0,0 +1,92 @@
+# Стоимость проверки приземления и поиска верхней платформы за кадр:
+# полный перебор группы против индекса world.PlatformGroup.
+#
+#   python -m benchmarks.platform_index
+import argparse
+import random
+import time
+
+import pygame
+
+import headless
+from world import (
+    NO_INPUT,
+    PLATFORM_HEIGHT,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    Platform,
+    PlatformGroup,
+    Player,
+)
+
+
+def build(count, group_class):
+    random.seed(count)
+    group = group_class()
+    for i in range(count):
+        width = random.randint(40, 60)
+        x = random.randint(0, SCREEN_WIDTH - width)
+        group.add(Platform(x, SCREEN_HEIGHT - 50 - i * 55, width, False))
+    return group
+
+
+def linear_frame(player, platforms, dy):
+    # Как было: colliderect со всеми платформами и min() по всей группе
+    landed = None
+    for platform in platforms:
+        if platform.rect.colliderect(
+            player.rect.x, player.rect.y + dy, player.rect.width, player.rect.height
+        ):
+            landed = platform
+    return landed, min(platform.rect.y for platform in platforms)
+
+
+def indexed_frame(player, platforms, dy):
+    landed = None
+    for platform in platforms.near(
+        player.rect.y + dy - PLATFORM_HEIGHT, player.rect.bottom + dy
+    ):
+        if platform.rect.colliderect(
+            player.rect.x, player.rect.y + dy, player.rect.width, player.rect.height
+        ):
+            landed = platform
+    return landed, platforms.topmost().rect.y
+
+
+def measure(frame, player, platforms, frames):
+    start = time.perf_counter()
+    for i in range(frames):
+        frame(player, platforms, i % 20)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Индекс платформ против перебора")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[10, 100, 1000, 10_000]
+    )
+    args = parser.parse_args()
+
+    player_frames, _ = headless.load_frames()
+    print(f"{'platforms':>10} {'linear us':>10} {'indexed us':>11} {'move() us':>10}")
+    for count in args.counts:
+        player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150, player_frames)
+        linear = measure(
+            linear_frame, player, build(count, pygame.sprite.Group), args.frames
+        )
+        platforms = build(count, PlatformGroup)
+        indexed = measure(indexed_frame, player, platforms, args.frames)
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            player.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150)
+            player.move(NO_INPUT, platforms, 1.0)
+        move = (time.perf_counter() - start) / args.frames
+        print(
+            f"{count:>10} {linear * 1e6:>10.2f} {indexed * 1e6:>11.2f} "
+            f"{move * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# Отрисовка кадра игры через поверхность окна (render.Renderer) и через
+# текстуры pygame._sdl2 (texture_render.TextureRenderer) при окне 1:1 и
+# увеличенном. Поверхности для увеличенного окна нужен transform.scale в
+# каждом кадре, текстуры растягивает SDL. Время включает вывод на экран.
+# Для 1:1 выводится и расхождение пикселей: SDL смешивает альфу по своей
+# формуле, поэтому полупрозрачные края отличаются на единицы.
+#
+#   python -m benchmarks.render_backends
+#   SDL_VIDEODRIVER=dummy python -m benchmarks.render_backends --frames 500
+import argparse
+import time
+
+import pygame
+
+import assets
+import headless
+import render
+import texture_render
+from benchmarks.blit_pipeline import SCENARIOS, worlds
+from world import SCREEN_HEIGHT, SCREEN_WIDTH
+
+SCALES = (1, 2)
+
+
+def measure(draw, sprites, options, frames, seed):
+    total = 0.0
+    for world in worlds(sprites, options, frames, seed):
+        start = time.perf_counter()
+        draw(world)
+        total += time.perf_counter() - start
+    return total / frames * 1000
+
+
+def surface_backend(registry, font, size):
+    screen = pygame.display.set_mode(size)
+    if size == (SCREEN_WIDTH, SCREEN_HEIGHT):
+        renderer = render.Renderer(screen, registry, font)
+
+        def draw(world):
+            renderer.draw(world, 0.5)
+            renderer.present()
+
+        return draw, screen
+    canvas = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    renderer = render.Renderer(canvas, registry, font)
+
+    def draw_scaled(world):
+        renderer.draw(world, 0.5)
+        pygame.transform.scale(canvas, size, screen)
+        pygame.display.update()
+
+    return draw_scaled, screen
+
+
+def texture_backend(registry, font, size, software):
+    texture_screen = texture_render.TextureScreen("bench", size, software=software)
+    renderer = texture_render.TextureRenderer(texture_screen, registry, font)
+
+    def draw(world):
+        renderer.draw(world, 0.5)
+        renderer.present()
+
+    return draw, texture_screen
+
+
+def pixel_diff(
+    surface_draw, screen, texture_draw, texture_screen, sprites, options, seed
+):
+    # Наибольшее отличие канала и доля отличающихся байтов на 50 кадрах
+    worst = 0
+    differing = 0
+    total = 0
+    for world in worlds(sprites, options, 50, seed):
+        surface_draw(world)
+        texture_draw(world)
+        ours = pygame.image.tobytes(screen, "RGB")
+        theirs = pygame.image.tobytes(texture_screen.renderer.to_surface(), "RGB")
+        for a, b in zip(ours, theirs):
+            if a != b:
+                differing += 1
+                worst = max(worst, abs(a - b))
+        total += len(ours)
+    return worst, differing / total
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Поверхность окна против текстур")
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    headless.init_display((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.font.init()
+    registry = assets.AssetRegistry()
+    assets.preload(registry)
+    font = pygame.font.SysFont("Lucida Sans", 20)
+    sprites = headless.load_frames(registry)
+
+    print(f"{'scenario':10} {'window':>9} {'backend':>11} {'ms/frame':>9}  pixels")
+    for name, options in SCENARIOS.items():
+        for scale in SCALES:
+            size = (SCREEN_WIDTH * scale, SCREEN_HEIGHT * scale)
+            window = f"{size[0]}x{size[1]}"
+            surface_draw, screen = surface_backend(registry, font, size)
+            ms = measure(surface_draw, sprites, options, args.frames, args.seed)
+            label = "surface" if scale == 1 else "surface+sc"
+            print(f"{name:10} {window:>9} {label:>11} {ms:>9.3f}")
+            for label, software in (("texture-sw", True), ("texture", False)):
+                try:
+                    draw, texture_screen = texture_backend(
+                        registry, font, size, software
+                    )
+                except pygame.error as error:
+                    print(f"{name:10} {window:>9} {label:>11}  нет: {error}")
+                    continue
+                ms = measure(draw, sprites, options, args.frames, args.seed)
+                pixels = ""
+                if scale == 1:
+                    worst, share = pixel_diff(
+                        surface_draw,
+                        screen,
+                        draw,
+                        texture_screen,
+                        sprites,
+                        options,
+                        args.seed,
+                    )
+                    pixels = f"max diff {worst}, {share:.2%} байт"
+                line = f"{name:10} {window:>9} {label:>11} {ms:>9.3f}  {pixels}"
+                print(line.rstrip())
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,79 @@
+# Запись и воспроизведение: игра, прогнанная заново по записи ввода,
+# должна совпасть с исходной побитово. Заодно размер записи на тик и
+# скорость прогона записи без окна.
+#
+#   python -m benchmarks.replay_determinism
+import argparse
+import random
+import time
+
+import headless
+from replay import InputRecorder, Recording, play
+from world import World
+
+
+def fingerprint(world):
+    return (
+        world.score,
+        world.ticks,
+        world.game_over,
+        tuple(world.player.rect),
+        world.player.vel_y,
+        sorted(tuple(platform.rect) for platform in world.platform_group),
+        sorted(tuple(enemy.rect) for enemy in world.enemy_group),
+    )
+
+
+def record(world, max_ticks):
+    policy = headless.GreedyPolicy()
+    recorder = InputRecorder(world)
+    while not world.game_over and world.ticks < max_ticks:
+        inputs = policy(world)
+        recorder.record(inputs)
+        world.step(inputs)
+    return recorder.recording()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=20_000)
+    parser.add_argument("--difficulty", type=float, default=1.0)
+    args = parser.parse_args()
+
+    frames = headless.load_frames()
+    world_classes = [World]
+    try:
+        from array_world import ArrayWorld
+
+        world_classes.append(ArrayWorld)
+    except ImportError:
+        pass
+    for world_class in world_classes:
+        ticks = size = 0
+        replay_time = 0.0
+        for i in range(args.runs):
+            world = world_class(
+                *frames, difficulty=args.difficulty, seed=random.getrandbits(64)
+            )
+            recording = Recording.from_bytes(record(world, args.ticks).to_bytes())
+            replayed = recording.new_world(world_class, *frames)
+            start = time.perf_counter()
+            play(replayed, recording)
+            replay_time += time.perf_counter() - start
+            if fingerprint(replayed) != fingerprint(world):
+                raise SystemExit(
+                    f"{world_class.__name__}: seed {world.seed} разошёлся на "
+                    f"воспроизведении (score {world.score} / {replayed.score})"
+                )
+            ticks += world.ticks
+            size += len(recording.to_bytes())
+        print(
+            f"{world_class.__name__:10} {args.runs} игр, {ticks} тиков совпали; "
+            f"запись {size * 8 / ticks:.2f} бит/тик, "
+            f"воспроизведение {ticks / replay_time:.0f} тиков/с"
+        )
+
+
+if __name__ == "__main__":
+    main()
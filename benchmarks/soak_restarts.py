@@ -0,0 +1,76 @@
+# Проверка, что перезапуски игры не копят память: сцены игры и GAME OVER
+# сменяют друг друга через SceneManager, старый World должен освобождаться.
+#
+#   python -m benchmarks.soak_restarts --restarts 1000
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+
+import pygame
+
+import headless  # noqa: F401  (включает dummy-драйверы SDL до импорта main)
+import main
+from leaderboard import Leaderboard
+from world import TICK, World
+
+
+def press(key):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+
+def live_worlds():
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, World))
+
+
+def main_loop(restarts, frames, report_every):
+    main.FPS = 0  # без ограничения кадров
+    main.asset_loader.wait()
+    # Результаты прогонов не должны попасть в настоящую таблицу рекордов
+    # и затереть запись последней игры
+    main.REPLAY_PATH = None
+    main.leaderboard = Leaderboard(
+        os.path.join(tempfile.mkdtemp(), "leaderboard.json")
+    )
+    manager = main.SceneManager(main.MainMenuScene())
+    press(main.BINDS["start"])
+    manager.step()
+    tracemalloc.start()
+    baseline = None
+    print(f"{'restart':>8} {'traced KiB':>11} {'worlds':>7} {'stack':>6}")
+    for restart in range(restarts + 1):
+        game = manager.top
+        for _ in range(frames):
+            game.accumulator = TICK  # ровно один тик логики на кадр
+            manager.step()
+        game.world.game_over = True
+        manager.step()  # -> GAME OVER
+        press(main.BINDS["start"])
+        manager.step()  # -> новая игра
+        del game
+        if restart % report_every == 0:
+            gc.collect()
+            current, _ = tracemalloc.get_traced_memory()
+            if baseline is None:
+                baseline = current
+            print(
+                f"{restart:>8} {current / 1024:>11.1f} {live_worlds():>7} "
+                f"{len(manager.stack):>6}"
+            )
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    print(f"growth after {restarts} restarts: {(current - baseline) / 1024:.1f} KiB")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Память при многократных рестартах")
+    parser.add_argument("--restarts", type=int, default=1000)
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--report-every", type=int, default=100)
+    args = parser.parse_args()
+    main_loop(args.restarts, args.frames, args.report_every)
+
+
+if __name__ == "__main__":
+    run()
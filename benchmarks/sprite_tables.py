@@ -0,0 +1,74 @@
+# Сравнение покадровой работы со спрайтами: как было (маски и отражение
+# считаются каждый кадр) и через таблицы assets.SpriteFrames.
+#
+#   python -m benchmarks.sprite_tables --frames 20000
+import argparse
+import time
+
+import pygame
+
+import assets
+import headless
+from world import ENEMY_ANIMATION_TIME, TICK
+
+
+def old_path(player_image, bird_images, frames):
+    enemy_frame = 0
+    enemy_time = 0
+    for _ in range(frames):
+        # Player.move
+        mask = pygame.mask.from_surface(player_image)
+        # Player.update при взгляде вправо
+        image = pygame.transform.flip(player_image, True, False)
+        mask = pygame.mask.from_surface(image)
+        # Enemy.update_animation
+        enemy_time += TICK
+        if enemy_time >= ENEMY_ANIMATION_TIME:
+            enemy_time = 0
+            enemy_frame = (enemy_frame + 1) % len(bird_images)
+            mask = pygame.mask.from_surface(bird_images[enemy_frame])
+    return mask
+
+
+def table_path(player_frames, bird_frames, frames):
+    enemy_frame = 0
+    enemy_time = 0
+    for _ in range(frames):
+        mask = player_frames.mask(0, True)
+        image = player_frames.image(0, True)
+        mask = player_frames.mask(0, True)
+        enemy_time += TICK
+        if enemy_time >= ENEMY_ANIMATION_TIME:
+            enemy_time = 0
+            enemy_frame = (enemy_frame + 1) % len(bird_frames)
+            mask = bird_frames.mask(enemy_frame)
+    return mask, image
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Маски и отражения: кадр за кадром против таблиц")
+    parser.add_argument("--frames", type=int, default=20_000)
+    args = parser.parse_args()
+
+    headless.init_display()
+    registry = assets.AssetRegistry()
+    player_image = assets.player_surface(registry)
+    bird_images = list(registry.sheet("bird").frames(assets.BIRD_SCALE))
+    player_frames, bird_frames = headless.load_frames(registry)
+
+    old = measure(old_path, player_image, bird_images, args.frames)
+    new = measure(table_path, player_frames, bird_frames, args.frames)
+    per_frame = 1_000_000 / args.frames
+    print(f"per-frame masks/flip: {old * per_frame:8.2f} us/frame")
+    print(f"SpriteFrames tables:  {new * per_frame:8.2f} us/frame")
+    print(f"speedup: {old / new:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
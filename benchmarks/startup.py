@@ -0,0 +1,55 @@
+# Время запуска игры: первый кадр (экран загрузки), готовность к игре (меню,
+# картинки и спрайты загружены) и полная загрузка со звуками. Каждый прогон -
+# отдельный процесс, чтобы мерить холодный импорт main.py.
+#
+#   python -m benchmarks.startup --runs 10
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+def child():
+    # Не через headless: тот импортирует pygame раньше, чем main начнёт отсчёт
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import main
+
+    manager = main.SceneManager(main.LoadingScene())
+    while not isinstance(manager.top, main.MainMenuScene):
+        manager.step()
+    main.asset_loader.wait()
+    print(json.dumps(main.startup_times))
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Время запуска игры")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    samples = {"first_frame": [], "interactive": [], "loaded": []}
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        times = json.loads(output.strip().splitlines()[-1])
+        for name in samples:
+            samples[name].append(times[name])
+    for name, values in samples.items():
+        print(
+            f"{name:12} median {statistics.median(values):6.1f} ms, "
+            f"max {max(values):6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    run()
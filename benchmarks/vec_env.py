@@ -0,0 +1,48 @@
+# Пропускная способность env.VecEnv со случайными действиями: тиков в
+# секунду и в час при разном числе процессов.
+#
+#   python -m benchmarks.vec_env --envs 64 --workers 0 --workers 8
+import argparse
+import os
+import random
+import time
+
+from env import ACTIONS, VecEnv
+
+
+def measure(envs, workers, steps, frame_skip):
+    rng = random.Random(0)
+    with VecEnv(envs, workers=workers, frame_skip=frame_skip) as vec:
+        vec.reset()
+        episodes = 0
+        scores = 0.0
+        start = time.perf_counter()
+        for _ in range(steps):
+            actions = [rng.randrange(len(ACTIONS)) for _ in range(envs)]
+            _, _, dones, infos = vec.step(actions)
+            for done, info in zip(dones, infos):
+                if done:
+                    episodes += 1
+                    scores += info["score"]
+        elapsed = time.perf_counter() - start
+    ticks = envs * steps * frame_skip  # без тиков, оставшихся после смерти
+    print(
+        f"workers={workers:<3} {ticks / elapsed:>10.0f} тиков/с "
+        f"({ticks / elapsed * 3600 / 1e6:.0f} млн/ч), игр {episodes}, "
+        f"средний счёт {scores / max(episodes, 1):.0f}"
+    )
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Скорость VecEnv")
+    parser.add_argument("--envs", type=int, default=64)
+    parser.add_argument("--workers", type=int, action="append")
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--frame-skip", type=int, default=4)
+    args = parser.parse_args()
+    for workers in args.workers or [0, os.cpu_count() or 1]:
+        measure(args.envs, workers, args.steps, args.frame_skip)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+
+from world import NO_INPUT, InputState, World
+
+# Действия агента: 0 - ничего не нажато, 1 - влево, 2 - вправо
+ACTIONS = (NO_INPUT, InputState(True, False), InputState(False, True))
+
+NEAREST_PLATFORMS = 5
+NEAREST_ENEMIES = 2
+# Игрок: x, y, ширина, высота, vel_y; платформа: dx, dy, ширина, движется;
+# враг: есть ли, dx, dy. Отсутствующие платформы и враги заполнены нулями.
+OBS_SIZE = 5 + 4 * NEAREST_PLATFORMS + 3 * NEAREST_ENEMIES
+
+
+def observe(world):
+    # Координаты платформ и врагов - относительно центра игрока, в пикселях
+    player = world.player
+    rect = player.rect
+    px, py = rect.center
+    obs = [rect.x, rect.y, rect.width, rect.height, player.vel_y]
+    platforms = sorted(
+        world.platform_group, key=lambda platform: abs(platform.rect.centery - py)
+    )[:NEAREST_PLATFORMS]
+    for platform in platforms:
+        obs += (
+            platform.rect.centerx - px,
+            platform.rect.top - rect.bottom,
+            platform.rect.width,
+            int(platform.moving),
+        )
+    obs += [0] * (4 * (NEAREST_PLATFORMS - len(platforms)))
+    enemies = sorted(
+        world.enemy_group, key=lambda enemy: abs(enemy.rect.centerx - px)
+    )[:NEAREST_ENEMIES]
+    for enemy in enemies:
+        obs += (1, enemy.rect.centerx - px, enemy.rect.centery - py)
+    obs += [0] * (3 * (NEAREST_ENEMIES - len(enemies)))
+    return obs
+
+
+class GameEnv:
+    """Одна игра как среда: reset() и step(action) -> (obs, reward, done, info).
+
+    Награда - прирост счёта за шаг. Шаг - frame_skip тиков с одним и тем же
+    действием. Закончившаяся игра сразу начинается заново со следующим seed,
+    а в info возвращаются итоги закончившейся (score, ticks, seed).
+    """
+
+    def __init__(
+        self, frames, seed, seed_step=1, frame_skip=1, max_ticks=None, **world_options
+    ):
+        self.frames = frames
+        self.seed = seed
+        self.seed_step = seed_step
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.world_options = world_options
+        self.world = None
+
+    def reset(self):
+        self.world = World(*self.frames, seed=self.seed, **self.world_options)
+        self.seed += self.seed_step
+        return observe(self.world)
+
+    def step(self, action):
+        world = self.world
+        score = world.score
+        inputs = ACTIONS[action]
+        for _ in range(self.frame_skip):
+            world.step(inputs)
+            if world.game_over:
+                break
+        reward = world.score - score
+        done = world.game_over or (
+            self.max_ticks is not None and world.ticks >= self.max_ticks
+        )
+        if not done:
+            return observe(world), reward, False, None
+        info = {"score": world.score, "ticks": world.ticks, "seed": world.seed}
+        return self.reset(), reward, True, info
+
+
+def worker(conn, seeds, seed_step, frame_skip, max_ticks, world_options):
+    import headless  # dummy-драйверы SDL: окна в процессах пула не нужны
+
+    frames = headless.load_frames()
+    envs = [
+        GameEnv(frames, seed, seed_step, frame_skip, max_ticks, **world_options)
+        for seed in seeds
+    ]
+    while True:
+        command, data = conn.recv()
+        if command == "step":
+            conn.send([env.step(action) for env, action in zip(envs, data)])
+        elif command == "reset":
+            conn.send([env.reset() for env in envs])
+        else:
+            conn.close()
+            return
+
+
+class VecEnv:
+    """num_envs независимых игр, которые шагают одним вызовом step(actions).
+
+    Игры поровну раскладываются по workers процессам (по умолчанию - по
+    числу ядер); процессы шагают параллельно, по трубе передаются только
+    действия и результаты. workers=0 - всё в текущем процессе, удобно для
+    отладки. Результаты возвращаются списками по num_envs элементов.
+    """
+
+    def __init__(
+        self,
+        num_envs,
+        workers=None,
+        seed=0,
+        frame_skip=1,
+        max_ticks=None,
+        **world_options,
+    ):
+        self.num_envs = num_envs
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, num_envs)
+        seeds = [seed + i for i in range(num_envs)]
+        options = (num_envs, frame_skip, max_ticks, world_options)
+        self.envs = None
+        self.pipes = []
+        self.processes = []
+        if workers == 0:
+            import headless
+
+            frames = headless.load_frames()
+            self.envs = [
+                GameEnv(frames, s, num_envs, frame_skip, max_ticks, **world_options)
+                for s in seeds
+            ]
+            return
+        context = multiprocessing.get_context("spawn")
+        for i in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=worker,
+                args=(child, seeds[i::workers], *options),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.pipes.append(parent)
+            self.processes.append(process)
+
+    def gather(self, command, per_worker):
+        for pipe, data in zip(self.pipes, per_worker):
+            pipe.send((command, data))
+        # Игра i живёт в процессе i % workers на позиции i // workers
+        results = [pipe.recv() for pipe in self.pipes]
+        workers = len(self.pipes)
+        return [results[i % workers][i // workers] for i in range(self.num_envs)]
+
+    def reset(self):
+        if self.envs is not None:
+            return [env.reset() for env in self.envs]
+        return self.gather("reset", [None] * len(self.pipes))
+
+    def step(self, actions):
+        if self.envs is not None:
+            results = [env.step(action) for env, action in zip(self.envs, actions)]
+        else:
+            workers = len(self.pipes)
+            per_worker = [actions[i::workers] for i in range(workers)]
+            results = self.gather("step", per_worker)
+        obs, rewards, dones, infos = zip(*results)
+        return list(obs), list(rewards), list(dones), list(infos)
+
+    def close(self):
+        for pipe in self.pipes:
+            pipe.send(("close", None))
+            pipe.close()
+        for process in self.processes:
+            process.join()
+        self.pipes = []
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
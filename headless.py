@@ -0,0 +1,108 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import assets
+from world import MAX_ENEMIES, MAX_PLATFORMS, NO_INPUT, TICK, InputState, World
+
+
+def init_display(size=(1, 1)):
+    pygame.display.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode(size)
+    return pygame.display.get_surface()
+
+
+def load_frames(registry=None):
+    # Маски строятся из тех же спрайтов, что и в игре, но окно не нужно
+    init_display()
+    if registry is None:
+        registry = assets.AssetRegistry()
+    return assets.player_frames(registry), assets.bird_frames(registry)
+
+
+class GreedyPolicy:
+    # После каждого прыжка выбирает ближайшую платформу выше и держит курс на неё
+    def __init__(self):
+        self.target = None
+        self.target_generation = None  # объект из пула может стать другой платформой
+        self.last_vel_y = 0
+
+    def target_alive(self):
+        return (
+            self.target.alive() and self.target.generation == self.target_generation
+        )
+
+    def __call__(self, world):
+        player = world.player
+        jumped = player.vel_y < self.last_vel_y
+        self.last_vel_y = player.vel_y
+        if jumped or (self.target is not None and not self.target_alive()):
+            self.target = None
+            for platform in world.platform_group:
+                if platform.rect.top >= player.rect.bottom:
+                    continue
+                if self.target is None or platform.rect.top > self.target.rect.top:
+                    self.target = platform
+            if self.target is not None:
+                self.target_generation = self.target.generation
+        if self.target is None:
+            return NO_INPUT
+        dx = self.target.rect.centerx - player.rect.centerx
+        return InputState(dx < -5, dx > 5)
+
+
+def run(world, policy=None, max_ticks=100_000):
+    if policy is None:
+        policy = GreedyPolicy()
+    while not world.game_over and world.ticks < max_ticks:
+        world.step(policy(world))
+    return world
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Прогон игры без окна")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--ticks", type=int, default=100_000)
+    parser.add_argument("--difficulty", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--platforms", type=int, default=MAX_PLATFORMS)
+    parser.add_argument("--enemies", type=int, default=MAX_ENEMIES)
+    parser.add_argument(
+        "--arrays", action="store_true", help="ArrayWorld на массивах NumPy"
+    )
+    args = parser.parse_args()
+
+    player_frames, enemy_frames = load_frames()
+    if args.arrays:
+        from array_world import ArrayWorld as world_class
+    else:
+        world_class = World
+    total_ticks = 0
+    start = time.perf_counter()
+    for i in range(args.runs):
+        world = world_class(
+            player_frames,
+            enemy_frames,
+            difficulty=args.difficulty,
+            max_platforms=args.platforms,
+            max_enemies=args.enemies,
+            seed=None if args.seed is None else args.seed + i,
+        )
+        run(world, max_ticks=args.ticks)
+        total_ticks += world.ticks
+        print(f"run {i}: score={world.score:.0f} ticks={world.ticks}")
+    elapsed = time.perf_counter() - start
+    print(
+        f"{total_ticks} ticks in {elapsed:.2f}s: {total_ticks / elapsed:.0f} ticks/s "
+        f"({total_ticks * TICK / elapsed:.0f}x real time)"
+    )
+
+
+if __name__ == "__main__":
+    main()
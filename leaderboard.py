@@ -0,0 +1,132 @@
+import json
+import os
+import time
+
+from storage import BackgroundWriter
+
+LEADERBOARD_SIZE = 10
+VERSION = 1
+
+
+def difficulty_key(difficulty):
+    # Сложность задаётся ползунком, поэтому таблицы ведутся с точностью 0.1
+    return f"{difficulty:.1f}"
+
+
+def check_entries(entries):
+    # Каждая запись - словарь с числовым score и строкой time, иначе best()
+    # и меню упадут уже посреди игры
+    if not isinstance(entries, list):
+        raise ValueError(f"таблица должна быть списком, а не {entries!r}")
+    for entry in entries:
+        if not (
+            isinstance(entry, dict)
+            and isinstance(entry.get("score"), (int, float))
+            and not isinstance(entry["score"], bool)
+            and isinstance(entry.get("time"), str)
+        ):
+            raise ValueError(f"неверная запись {entry!r}")
+    return entries
+
+
+def spare_path(path):
+    # path, если он свободен, иначе path.1, path.2, ...
+    candidate = path
+    number = 0
+    while os.path.exists(candidate):
+        number += 1
+        candidate = f"{path}.{number}"
+    return candidate
+
+
+class Leaderboard:
+    """Лучшие результаты по сложностям: в памяти и в JSON-файле.
+
+    Чтение (best, top) идёт только из памяти. submit() обновляет таблицу и
+    отдаёт снимок фоновому писателю, поэтому кадр на диск не ждёт, а
+    несколько результатов подряд записываются одним файлом. Файл заменяется
+    атомарно, так что падение посреди записи оставит прежнюю версию.
+    """
+
+    def __init__(self, path, size=LEADERBOARD_SIZE, legacy_path=None, writer=None):
+        self.path = path
+        self.size = size
+        self.boards = {}  # ключ сложности -> записи по убыванию счёта
+        self.writer = writer or BackgroundWriter(name="leaderboard")
+        self.load(legacy_path)
+
+    def load(self, legacy_path=None):
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+            self.boards = {
+                key: check_entries(entries)[: self.size]
+                for key, entries in data["boards"].items()
+            }
+        except FileNotFoundError:
+            if legacy_path is not None:
+                self.import_legacy(legacy_path)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            # Испорченный файл не теряем молча: откладываем его в сторону,
+            # не затирая то, что отложено раньше
+            bad_path = spare_path(self.path + ".bad")
+            print(
+                f"Таблица рекордов {self.path} повреждена ({error}), начинаем "
+                f"новую; старая сохранена в {bad_path}"
+            )
+            self.boards = {}
+            os.replace(self.path, bad_path)
+
+    def import_legacy(self, path):
+        # Рекорд из старого score.txt (одно число, записанное как float)
+        try:
+            with open(path, "r") as file:
+                score = float(file.read())
+            timestamp = os.path.getmtime(path)
+        except (OSError, ValueError):
+            return
+        self.submit(score, 1.0, timestamp)
+
+    def submit(self, score, difficulty, timestamp=None):
+        """Добавляет результат; возвращает место в таблице (с 1) или None."""
+        if score <= 0:
+            return None
+        key = difficulty_key(difficulty)
+        entries = self.boards.setdefault(key, [])
+        rank = 0
+        while rank < len(entries) and entries[rank]["score"] >= score:
+            rank += 1
+        if rank >= self.size:
+            return None
+        if timestamp is None:
+            timestamp = time.time()
+        entries.insert(
+            rank,
+            {
+                "score": score,
+                "difficulty": difficulty,
+                "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)),
+            },
+        )
+        del entries[self.size :]
+        self.save()
+        return rank + 1
+
+    def save(self):
+        data = json.dumps({"version": VERSION, "boards": self.boards}, indent=1)
+        self.writer.write(self.path, data.encode())
+
+    def top(self, difficulty):
+        return list(self.boards.get(difficulty_key(difficulty), ()))
+
+    def best(self, difficulty=None):
+        if difficulty is not None:
+            entries = self.boards.get(difficulty_key(difficulty))
+            return entries[0]["score"] if entries else 0
+        return max(
+            (entries[0]["score"] for entries in self.boards.values() if entries),
+            default=0,
+        )
+
+    def flush(self, timeout=None):
+        return self.writer.flush(timeout)
@@ -0,0 +1,70 @@
+import queue
+import threading
+
+import pygame
+
+# Событие "задача загрузки готова" - будит даже меню, которое спит в ожидании
+LOADED = pygame.event.custom_type()
+
+
+class AssetLoader:
+    """Загрузка ассетов в фоновом потоке.
+
+    Задача состоит из load и finish. load выполняется в потоке загрузчика
+    (чтение с диска, декодирование PNG и MP3), finish - в главном потоке
+    внутри poll(): там можно трогать дисплей (convert_alpha) и глобальное
+    состояние игры. Поток один, поэтому задачи завершаются в порядке submit().
+    """
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.total = 0
+        self.finished = set()
+        self.thread = threading.Thread(target=self.work, name="assets", daemon=True)
+
+    def submit(self, name, load, finish=None):
+        self.total += 1
+        self.jobs.put((name, load, finish))
+
+    def start(self):
+        self.thread.start()
+
+    def work(self):
+        while True:
+            name, load, finish = self.jobs.get()
+            try:
+                self.results.put((name, load(), finish, None))
+            except Exception as error:
+                self.results.put((name, None, finish, error))
+            pygame.event.post(pygame.event.Event(LOADED, asset=name))
+
+    def apply(self, name, result, finish, error):
+        if error is not None:
+            # Без ассета игра не запустится - ошибка всплывает в главном потоке
+            raise error
+        if finish is not None:
+            finish(result)
+        self.finished.add(name)
+
+    def poll(self):
+        while True:
+            try:
+                item = self.results.get_nowait()
+            except queue.Empty:
+                return
+            self.apply(*item)
+
+    def wait(self, *names):
+        # Блокирующее ожидание; без имён - пока не будет загружено всё
+        while not self.ready(*names):
+            self.apply(*self.results.get())
+
+    def ready(self, *names):
+        if not names:
+            return len(self.finished) == self.total
+        return all(name in self.finished for name in names)
+
+    @property
+    def progress(self):
+        return len(self.finished) / self.total if self.total else 1.0
@@ -1,70 +1,238 @@
+import time
+
+STARTED = time.perf_counter()  # отсчёт для замеров запуска
+
 import pygame
-import random
 import os
 from pygame import mixer
 
-
-def path_gen(path):
-    return r"\\".join(str(os.path.abspath(__file__)).split("\\")[0:-1]) + r"\\" + path
+import assets
+import audio
+import memstats
+import render
+import texture_render
+from assets import path_gen
+from leaderboard import Leaderboard
+from loader import LOADED, AssetLoader
+from memstats import memory
+from profiler import profiler
+from replay import InputRecorder
+from render import BLACK, WHITE
+from scenes import Scene, SceneManager
+from settings import Settings
+from storage import BackgroundWriter
+from world import (
+    DEATH,
+    JUMP,
+    MAX_STEPS_PER_FRAME,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    TICK,
+    InputState,
+    World,
+)
 
 
 pygame.init()
 mixer.init()
 
-SCREEN_WIDTH = 400
-SCREEN_HEIGHT = 600
-SCROLL_THRESH = 200
-GRAVITY = 1
-MAX_PLATFORMS = 10
+# Голоса на категорию: частые прыжки не займут все каналы и не оборвут смерть
+SOUND_CHANNELS = {
+    "jump": (2, audio.STEAL_OLDEST),
+    "death": (1, audio.STEAL_OLDEST),
+}
+sound_channels = audio.reserve_channels(SOUND_CHANNELS)
 
 
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
 GREY = (100, 100, 100)
 
 
 font_small = pygame.font.SysFont("Lucida Sans", 20)
 font_big = pygame.font.SysFont("Lucida Sans", 24)
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Игрулька")
-icon = pygame.image.load(path_gen(r"assets\ghost.png"))
-pygame.display.set_icon(icon)
+# JUMPY_RENDERER: surface - программная отрисовка на поверхность окна,
+# texture - pygame._sdl2 Renderer и текстуры, texture-sw - то же на
+# программном рендерере SDL. Окно текстурного режима масштабируется до
+# JUMPY_WINDOW (например 800x1200) и меняет размер мышью.
+RENDER_BACKEND = os.environ.get("JUMPY_RENDERER", "surface")
+WINDOW_SIZE = tuple(
+    int(side)
+    for side in os.environ.get(
+        "JUMPY_WINDOW", f"{SCREEN_WIDTH}x{SCREEN_HEIGHT}"
+    ).split("x")
+)
+
+if RENDER_BACKEND == "surface":
+    texture_screen = None
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Игрулька")
+else:
+    # Скрытое окно нужно только для convert(), кадры идут в окно TextureScreen
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    texture_screen = texture_render.TextureScreen(
+        "Игрулька", WINDOW_SIZE, software=RENDER_BACKEND == "texture-sw"
+    )
+    screen = texture_screen.canvas
 
-pygame.mixer.music.load(path_gen(r"assets\fuyu-biyori bgm.mp3"))
-pygame.mixer.music.set_volume(0.9)
-pygame.mixer.music.play(-1, 0.0)
-jump_fx = pygame.mixer.Sound(path_gen(r"assets\jump.mp3"))
-jump_fx.set_volume(1)
-death_fx = pygame.mixer.Sound(path_gen(r"assets\death.mp3"))
-death_fx.set_volume(1)
-
-jumpy_image = pygame.image.load(path_gen(r"assets\bocchi1.png")).convert_alpha()
-bg_image = pygame.image.load(path_gen(r"assets\background2.png")).convert_alpha()
-platform_image = pygame.image.load(path_gen(r"assets\wood.png")).convert_alpha()
-bird_sheet_img = pygame.image.load(path_gen(r"assets\bird.png")).convert_alpha()
+clock = pygame.time.Clock()
+FPS = 60  # ограничение частоты кадров, на скорость игры не влияет
+# Запись последней игры, см. replay.py; None - не записывать (бенчмарки)
+REPLAY_PATH = r"replays\last.rec"
+TRACE_PATH = r"profiles\frame_trace.json"
+MEMORY_LOG_PATH = r"profiles\memory.jsonl"  # строка JSON раз в MEMORY_LOG_INTERVAL
+MEMORY_LOG_INTERVAL = 60_000  # мс
+MEMORY_LOG = pygame.event.custom_type()
+
+# Ассеты грузятся в фоне (см. LoadingScene), до готовности тут None
+registry = assets.AssetRegistry()
+player_frames = None
+bird_frames = None
+renderer = None
+profiler_overlay = None
+jump_fx = None
+death_fx = None
+startup_times = {}  # мс от запуска: first_frame, interactive, loaded
+
+
+# Таблица рекордов читается один раз, дальше меню берут её из памяти;
+# старый score.txt переносится в неё при первом запуске
+leaderboard = Leaderboard(
+    path_gen(r"leaderboard.json"), legacy_path=path_gen(r"score.txt")
+)
+
+# Настройки тоже читаются один раз; BINDS - тот же словарь, что в settings,
+# переназначение клавиш меняет его на месте
+settings = Settings(path_gen(r"key_bindings.json"), path_gen(r"settings.json"))
+BINDS = settings.bindings
+
+# Лог памяти и запись последней игры пишутся в фоне, не задерживая кадр
+file_writer = BackgroundWriter(name="files")
+
+
+def sprite_frames_surfaces(frames):
+    return [] if frames is None else [*frames.images[0], *frames.images[1]]
+
+
+# Кто держит поверхности; отчёт собирается по запросу (F6) и в лог
+memory.add_owner(
+    "background",
+    lambda: registry.surfaces("background") + [renderer and renderer.bg_canvas],
+)
+memory.add_owner(
+    "platform",
+    lambda: registry.surfaces("platform") + registry.surfaces("platform_broken"),
+)
+memory.add_owner(
+    "player",
+    lambda: registry.surfaces("player") + sprite_frames_surfaces(player_frames),
+)
+memory.add_owner(
+    "enemy", lambda: registry.surfaces("bird") + sprite_frames_surfaces(bird_frames)
+)
+memory.add_owner(
+    "text",
+    lambda: [
+        *render.text_cache.entries.values(),
+        *(surf for _, surf in render.text_cache.slots.values()),
+        profiler_overlay and profiler_overlay.panel,
+    ],
+)
+memory.add_owner("ui", lambda: [screen] + registry.surfaces("icon"))
+memory.add_group(
+    "platforms", lambda: [world.platform_group for world in memory.objects("world")]
+)
+memory.add_group(
+    "platform_pool",
+    lambda: [
+        world.platform_pool.free
+        for world in memory.objects("world")
+        if hasattr(world, "platform_pool")
+    ],
+)
+memory.add_group(
+    "enemies", lambda: [world.enemy_group for world in memory.objects("world")]
+)
+
+
+def log_memory(_=None):
+    # Раз в минуту, без снимка tracemalloc; строка дописывается в фоне
+    memory.write(path_gen(MEMORY_LOG_PATH), memory.report(False), file_writer)
+
+
+def report_memory():
+    # F6 включает и выключает tracemalloc: отчёт при выключении показывает
+    # прирост выделений за время между двумя нажатиями
+    report = memory.report()
+    print(memstats.format_report(report))
+    memory.write(path_gen(MEMORY_LOG_PATH), report, file_writer)
+    if memory.toggle_tracing():
+        print("tracemalloc включён, F6 ещё раз - прирост выделений")
+    else:
+        print("tracemalloc выключен")
 
 
-clock = pygame.time.Clock()
-FPS = 60
+def since_start():
+    return (time.perf_counter() - STARTED) * 1000
 
 
-def load_high_score():
-    score_path = path_gen(r"score.txt")
-    if os.path.exists(score_path):
-        with open(score_path, "r") as file:
-            try:
-                return int(file.read())
-            except:
-                return 0
+def images_loaded(_):
+    global player_frames, bird_frames, renderer, profiler_overlay
+    assets.preload(registry)
+    player_frames = assets.player_frames(registry)
+    bird_frames = assets.bird_frames(registry)
+    if texture_screen is None:
+        pygame.display.set_icon(registry.image("icon"))
+        renderer = render.Renderer(screen, registry, font_small)
     else:
-        return 0
+        texture_screen.window.set_icon(registry.image("icon"))
+        renderer = texture_render.TextureRenderer(texture_screen, registry, font_small)
+    profiler_overlay = render.ProfilerOverlay(pygame.font.SysFont("Lucida Sans", 14))
+
+
+def jump_loaded(sound):
+    global jump_fx
+    sound.set_volume(settings.get("jump_volume"))
+    jump_fx = sound
 
 
-def save_high_score(score):
-    score_path = path_gen(r"score.txt")
-    with open(score_path, "w") as file:
-        file.write(str(score))
+def death_loaded(sound):
+    global death_fx
+    sound.set_volume(settings.get("death_volume"))
+    death_fx = sound
+
+
+def music_loaded(_):
+    pygame.mixer.music.set_volume(settings.get("music_volume"))
+    pygame.mixer.music.play(-1, 0.0)
+
+
+def all_loaded(_):
+    startup_times["loaded"] = since_start()
+    print(f"Все ассеты загружены: {startup_times['loaded']:.0f} мс")
+
+
+# Порядок важен: поток один, а меню ждёт только картинки ("sprites")
+asset_loader = AssetLoader()
+for name in assets.IMAGES:
+    asset_loader.submit(
+        name,
+        lambda name=name: assets.decode_image(name),
+        lambda image, name=name: registry.add(name, image),
+    )
+asset_loader.submit("sprites", lambda: None, images_loaded)
+asset_loader.submit(
+    "jump_fx", lambda: audio.load_sound(r"assets\jump.mp3"), jump_loaded
+)
+asset_loader.submit(
+    "death_fx", lambda: audio.load_sound(r"assets\death.mp3"), death_loaded
+)
+asset_loader.submit(
+    "music",
+    lambda: pygame.mixer.music.load(path_gen(r"assets\fuyu-biyori bgm.mp3")),
+    music_loaded,
+)
+asset_loader.submit("all", lambda: None, all_loaded)
+asset_loader.start()
 
 
 class Slider:
@@ -82,11 +250,15 @@ class Slider:
         pygame.draw.rect(screen, (200, 200, 200), self.rect)
         handle_rect = pygame.Rect(self.handle_pos - 5, self.rect.y - 5, 10, 30)
         pygame.draw.rect(screen, (100, 100, 100), handle_rect)
-        label_surf = self.font.render(
-            f"{self.label}: {int(self.value * 100)}%", True, WHITE
-        )
-        draw_outlined_text(
-            label_surf, self.font, BLACK, screen, self.rect.x, self.rect.y - 25
+        render.draw_text_with_outline(
+            screen,
+            f"{self.label}: {int(self.value * 100)}%",
+            self.font,
+            WHITE,
+            BLACK,
+            self.rect.x,
+            self.rect.y - 25,
+            slot=self.label,
         )
 
     def handle_event(self, event):
@@ -103,296 +275,87 @@ class Slider:
                 )
                 ratio = (self.handle_pos - self.rect.x) / self.rect.width
                 self.value = self.min_val + ratio * (self.max_val - self.min_val)
-
-
-def draw_outlined_text(text_surf, font, outline_color, screen, x, y, center=False):
-    outline_range = [-1, 0, 1]
-    for ox in outline_range:
-        for oy in outline_range:
-            if ox != 0 or oy != 0:
-                pos = (x + ox, y + oy)
-                if center:
-                    screen.blit(text_surf, text_surf.get_rect(center=(x + ox, y + oy)))
-                else:
-                    screen.blit(text_surf, (x + ox, y + oy))
-    if center:
-        screen.blit(text_surf, text_surf.get_rect(center=(x, y)))
-    else:
-        screen.blit(text_surf, (x, y))
+                return True  # ползунок сдвинулся, нужна перерисовка
+        return False
 
 
 def draw_text_with_outline(text, font, color, outline_color, x, y, center=False):
-    text_surf = font.render(text, True, color)
-    draw_outlined_text(text_surf, font, outline_color, screen, x, y, center)
-
-
-def draw_panel():
-    draw_text_with_outline("SCORE: " + str(score), font_small, WHITE, BLACK, 10, 10)
+    render.draw_text_with_outline(
+        screen, text, font, color, outline_color, x, y, center
+    )
 
 
 def draw_bg(scroll):
-    screen.blit(bg_image, (0, scroll))
-    screen.blit(bg_image, (0, scroll - SCREEN_HEIGHT))
-
-
-class SpriteSheet:
-    def __init__(self, sheet):
-        self.sheet = sheet
-
-    def get_image(self, frame, width, height, scale, color):
-        image = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
-        image.blit(self.sheet, (0, 0), (frame * width, 0, width, height))
-        image = pygame.transform.scale(image, (int(width * scale), int(height * scale)))
-        image.set_colorkey(color)
-        return image
-
-
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, spritesheet, scale, speed=2):
-        super().__init__()
-        self.spritesheet = SpriteSheet(spritesheet)
-        self.images = self.load_images(scale)
-        self.current_frame = 0
-        self.image = self.images[self.current_frame]
-        self.rect = self.image.get_rect(center=(x, y))
-        self.speed = speed
-        self.animation_time = 0.1
-        self.current_time = 0
-        self.mask = pygame.mask.from_surface(self.image)
-
-    def load_images(self, scale):
-        images = []
-        for frame in range(4):
-            image = self.spritesheet.get_image(frame, 64, 64, scale, (0, 0, 0))
-            images.append(image)
-        return images
-
-    def update_animation(self, dt):
-        self.current_time += dt
-        if self.current_time >= self.animation_time:
-            self.current_time = 0
-            self.current_frame = (self.current_frame + 1) % len(self.images)
-            self.image = self.images[self.current_frame]
-            self.mask = pygame.mask.from_surface(self.image)
-
-    def update(self, scroll, screen_width, dt, difficulty):
-        self.update_animation(dt)
-        self.rect.x -= self.speed * difficulty
-        self.rect.y += scroll
-        if self.rect.right < 0:
-            self.kill()
-
-
-class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.original_image = pygame.transform.scale(jumpy_image, (45, 45))
-        self.image = self.original_image
-        self.rect = self.image.get_rect(center=(x, y))
-        self.vel_y = 0
-        self.flip = False
-        self.mask = pygame.mask.from_surface(self.image)
-
-    def move(self, platforms, jump_fx, difficulty):
-        scroll = 0
-        dx = 0
-        dy = 0
-        key = pygame.key.get_pressed()
-        if key[BINDS["move_left"]]:  # Используем бинды вместо pygame.K_a
-            dx = -10 * difficulty
-            self.flip = False
-        if key[BINDS["move_right"]]:  # Используем бинды вместо pygame.K_d
-            dx = 10 * difficulty
-            self.flip = True
-        self.vel_y += GRAVITY
-        dy += self.vel_y
-        self.rect.x += dx
-        # Экранирование игрока с противоположной стороны
-        if self.rect.right < 0:
-            self.rect.left = SCREEN_WIDTH
-        elif self.rect.left > SCREEN_WIDTH:
-            self.rect.right = 0
-        for platform in platforms:
-            if platform.rect.colliderect(
-                self.rect.x, self.rect.y + dy, self.rect.width, self.rect.height
-            ):
-                if self.vel_y > 0 and self.rect.bottom < platform.rect.centery:
-                    self.rect.bottom = platform.rect.top
-                    dy = 0
-                    self.vel_y = -20
-                    jump_fx.play()
-        if self.rect.top <= SCROLL_THRESH and self.vel_y < 0:
-            scroll = -dy
-        self.rect.y += dy + scroll
-        self.mask = pygame.mask.from_surface(self.image)
-        return scroll
-
-    def update(self):
-        if self.flip:
-            self.image = pygame.transform.flip(self.original_image, True, False)
-        else:
-            self.image = self.original_image
-        self.mask = pygame.mask.from_surface(self.image)
-
-    def draw(self):
-        screen.blit(self.image, self.rect)
+    renderer.draw_bg(scroll)
 
 
-class Platform(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, moving, destroyable=False, player=None):
-        super().__init__()
-        self.image = pygame.transform.scale(platform_image, (width, 10))
-        self.moving = moving
-        self.move_counter = random.randint(0, 50)
-        self.direction = random.choice([-1, 1])
-        self.speed = random.randint(1, 2)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-        self.destroyable = destroyable
-        self.player = player
-        self.is_stepped_on = False  # Новый атрибут для отслеживания прыжка
-        self.original_image = self.image  # Сохраняем оригинальный спрайт
-        self.destroyable_image = pygame.image.load(
-            path_gen(r"assets\wood2.png")
-        ).convert_alpha()  # Загрузка спрайта разрушенной платформы
-        self.destroyable_image = pygame.transform.scale(
-            self.destroyable_image, (width, 10)
-        )
-
-    def update(self, scroll, difficulty, player):
-        if self.moving:
-            self.move_counter += 1
-            self.rect.x += self.direction * self.speed * difficulty
-            if (
-                self.move_counter >= 100
-                or self.rect.left < 0
-                or self.rect.right > SCREEN_WIDTH
-            ):
-                self.direction *= -1
-                self.move_counter = 0
-        self.rect.y += scroll
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
-
-        # Проверяем прыжок и устанавливаем платформу как "задействованную"
-        if self.destroyable and self.rect.colliderect(player.rect):
-            if not self.is_stepped_on:
-                self.is_stepped_on = True
-                self.image = self.destroyable_image  # Меняем спрайт на `wood2`
-
-        # Разрушаем платформу с 25% шансом, если она уже использована
-        if self.is_stepped_on and not self.rect.colliderect(player.rect):
-            if random.random() < 0.25:  # 25% шанс
-                self.kill()  # Уничтожаем платформу
-
+def present_screen():
+    if texture_screen is None:
+        pygame.display.update()
+    else:
+        texture_screen.present()
 
-import json
 
+def read_inputs():
+    key = pygame.key.get_pressed()
+    return InputState(key[BINDS["move_left"]], key[BINDS["move_right"]])
 
-class GameSettings:
-    def __init__(self):
-        global BINDS
-        self.key_bindings = {
-            "move_left": pygame.K_a,
-            "move_right": pygame.K_d,
-            "pause": pygame.K_p,
-            "menu": pygame.K_m,
-            "start": pygame.K_RETURN,
-            "settings": pygame.K_s,
-            "quit": pygame.K_q,
-            "back": pygame.K_b,
-        }
-        BINDS = self.key_bindings  # Инициализация глобальных биндов
-        self.forbidden_keys = [
-            pygame.K_UP,
-            pygame.K_DOWN,
-            pygame.K_BACKSPACE,
-            pygame.K_r,
-        ]  # Запрещенные клавиши
-        self.load_key_bindings()
-
-    def load_key_bindings(self):
-        global BINDS
-        try:
-            with open(path_gen(r"key_bindings.json"), "r") as file:
-                self.key_bindings = json.load(file)
-                BINDS = self.key_bindings  # Обновляем глобальные бинды
-        except FileNotFoundError:
-            pass
-
-    def save_key_bindings(self):
-        with open(path_gen(r"key_bindings.json"), "w") as file:
-            json.dump(self.key_bindings, file)
-
-    def rebind_key(self, action, new_key):
-        global BINDS  # Указываем, что работаем с глобальной переменной
-
-        # Проверка на запрещенные клавиши
-        if new_key in self.forbidden_keys:
-            print(f"Клавиша {pygame.key.name(new_key)} запрещена для бинда.")
-            return False
-
-        # Проверка, используется ли уже эта клавиша
-        if new_key in self.key_bindings.values():
-            print(
-                f"Клавиша {pygame.key.name(new_key)} уже используется для другого действия."
-            )
-            return False
 
-        if action in self.key_bindings:
-            self.key_bindings[action] = new_key
-            self.save_key_bindings()
-            BINDS = self.key_bindings  # Обновляем глобальные бинды
-            return True
-        return False
+def apply_setting(name, value):
+    # Громкость меняется сразу, пока двигают ползунок
+    if name == "music_volume":
+        pygame.mixer.music.set_volume(value)
+    elif name == "jump_volume" and jump_fx:
+        jump_fx.set_volume(value)
+    elif name == "death_volume" and death_fx:
+        death_fx.set_volume(value)
 
 
-BINDS = GameSettings().key_bindings
+settings.subscribe(apply_setting)
 
 
 class RebindMenu:
-    def __init__(self, game_settings):
-        self.game_settings = game_settings
+    def __init__(self, settings):
+        self.settings = settings
         self.rebind_menu_items = [
             {
                 "action": "move_left",
-                "key": self.game_settings.key_bindings["move_left"],
+                "key": self.settings.bindings["move_left"],
                 "text": "Движение влево",
             },
             {
                 "action": "move_right",
-                "key": self.game_settings.key_bindings["move_right"],
+                "key": self.settings.bindings["move_right"],
                 "text": "Движение вправо",
             },
             {
                 "action": "pause",
-                "key": self.game_settings.key_bindings["pause"],
+                "key": self.settings.bindings["pause"],
                 "text": "Пауза",
             },
             {
                 "action": "menu",
-                "key": self.game_settings.key_bindings["menu"],
+                "key": self.settings.bindings["menu"],
                 "text": "Меню",
             },
             {
                 "action": "start",
-                "key": self.game_settings.key_bindings["start"],
+                "key": self.settings.bindings["start"],
                 "text": "Старт",
             },
             {
                 "action": "settings",
-                "key": self.game_settings.key_bindings["settings"],
+                "key": self.settings.bindings["settings"],
                 "text": "Настройки",
             },
             {
                 "action": "quit",
-                "key": self.game_settings.key_bindings["quit"],
+                "key": self.settings.bindings["quit"],
                 "text": "Выход",
             },
             {
                 "action": "back",
-                "key": self.game_settings.key_bindings["back"],
+                "key": self.settings.bindings["back"],
                 "text": "Назад",
             },
         ]
@@ -452,18 +415,61 @@ class RebindMenu:
             ):
                 action = self.rebind_menu_items[self.selected_item]["action"]
                 new_key = event.key
-                if self.game_settings.rebind_key(action, new_key):
+                if self.settings.rebind(action, new_key):
                     self.rebind_menu_items[self.selected_item]["key"] = new_key
-            elif event.key == pygame.K_BACKSPACE:
-                self.game_settings.rebind_mode = False
-                self.game_settings.rebind_action = None
-                self.game_settings.rebind_new_key = None
 
 
-def main_menu(high_score):
-    menu = True
-    difficulty = 1.0
-    while menu:
+class LoadingScene(Scene):
+    # Показывается сразу после открытия окна, пока ассеты грузятся в фоне
+    idle = False
+
+    def __init__(self):
+        super().__init__()
+        self.progress = None
+
+    def update(self):
+        clock.tick(FPS)
+        asset_loader.poll()
+        if asset_loader.ready("sprites"):
+            # Всё, что нужно меню и игре, готово; звуки догрузятся сами
+            startup_times["interactive"] = since_start()
+            # Если всё загрузилось раньше экрана загрузки, первым кадром будет меню
+            startup_times.setdefault("first_frame", startup_times["interactive"])
+            print(
+                f"Запуск: первый кадр {startup_times['first_frame']:.0f} мс, "
+                f"готово к игре {startup_times['interactive']:.0f} мс"
+            )
+            self.manager.replace(MainMenuScene())
+        elif asset_loader.progress != self.progress:
+            self.progress = asset_loader.progress
+            self.redraw = True
+
+    def draw(self):
+        super().draw()
+        if "first_frame" not in startup_times:
+            startup_times["first_frame"] = since_start()
+
+    def render(self):
+        screen.fill(BLACK)
+        draw_text_with_outline(
+            "Загрузка...",
+            font_big,
+            WHITE,
+            BLACK,
+            SCREEN_WIDTH // 2,
+            SCREEN_HEIGHT // 2 - 30,
+            True,
+        )
+        bar = pygame.Rect(0, 0, 200, 16)
+        bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10)
+        pygame.draw.rect(screen, GREY, bar)
+        pygame.draw.rect(
+            screen, WHITE, (bar.x, bar.y, int(bar.width * (self.progress or 0)), bar.h)
+        )
+
+
+class MainMenuScene(Scene):
+    def render(self):
         screen.fill(BLACK)
         draw_bg(0)
         draw_text_with_outline(
@@ -512,7 +518,7 @@ def main_menu(high_score):
             True,
         )
         draw_text_with_outline(
-            f"Рекорд: {high_score}",
+            f"Рекорд: {leaderboard.best()}",
             font_small,
             WHITE,
             BLACK,
@@ -520,60 +526,83 @@ def main_menu(high_score):
             SCREEN_HEIGHT // 2 + 120,
             True,
         )
-        pygame.display.update()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == BINDS["start"]:
-                    menu = False
-                    main_game(high_score, difficulty)
-                if event.key == BINDS["quit"]:
-                    pygame.quit()
-                    quit()
-                if event.key == BINDS["settings"]:
-                    difficulty = settings_menu()
-                if event.key == pygame.K_r:
-                    game_settings = GameSettings()
-                    reb = RebindMenu(game_settings)
-                    reb_menu = True
-                    while reb_menu:
-                        reb.draw(screen)
-                        for event in pygame.event.get():
-                            if event.type == pygame.QUIT:
-                                pygame.quit()
-                                quit()
-                            reb.handle_event(event)
-                            if event.type == pygame.KEYDOWN:
-                                if event.key == pygame.K_BACKSPACE:
-                                    reb_menu = False
-                        pygame.display.update()
-                    menu = True
-                if event.key == pygame.K_i:
-                    print(BINDS)
-
-
-def settings_menu():
-    settings = True
-    music_volume = pygame.mixer.music.get_volume()
-    jump_volume_val = jump_fx.get_volume() if jump_fx else 0
-    death_volume_val = death_fx.get_volume() if death_fx else 0
-    difficulty = 1.0
-    music_slider = Slider(100, 150, 200, 0.0, 1.0, music_volume, "Music Volume")
-    jump_slider = Slider(100, 200, 200, 0.0, 1.0, jump_volume_val, "Jump Volume")
-    death_slider = Slider(100, 250, 200, 0.0, 1.0, death_volume_val, "Death Volume")
-    difficulty_slider = Slider(100, 300, 200, 0.5, 3.0, difficulty, "Difficulty")
-    while settings:
+        for i, entry in enumerate(leaderboard.top(settings.get("difficulty"))[:3]):
+            draw_text_with_outline(
+                f"{i + 1}. {entry['score']:.0f}  ({entry['time'][:10]})",
+                font_small,
+                WHITE,
+                BLACK,
+                SCREEN_WIDTH // 2,
+                SCREEN_HEIGHT // 2 + 160 + i * 30,
+                True,
+            )
+
+    def handle_event(self, event):
+        super().handle_event(event)
+        if event.type == pygame.KEYDOWN:
+            if event.key == BINDS["start"]:
+                self.manager.replace(
+                    GameScene(leaderboard.best(), settings.get("difficulty"))
+                )
+            elif event.key == BINDS["quit"]:
+                self.manager.quit()
+            elif event.key == BINDS["settings"]:
+                self.manager.push(SettingsScene())
+            elif event.key == pygame.K_r:
+                self.manager.push(RebindScene())
+            elif event.key == pygame.K_i:
+                print(BINDS)
+            elif event.key == pygame.K_F6:
+                report_memory()
+
+
+class RebindScene(Scene):
+    def __init__(self):
+        super().__init__()
+        self.menu = RebindMenu(settings)
+
+    def render(self):
+        self.menu.draw(screen)
+
+    def handle_event(self, event):
+        super().handle_event(event)
+        self.menu.handle_event(event)
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_BACKSPACE:
+                self.manager.pop()
+
+
+class SettingsScene(Scene):
+    def __init__(self):
+        super().__init__()
+        self.music_slider = Slider(
+            100, 150, 200, 0.0, 1.0, settings.get("music_volume"), "Music Volume"
+        )
+        self.jump_slider = Slider(
+            100, 200, 200, 0.0, 1.0, settings.get("jump_volume"), "Jump Volume"
+        )
+        self.death_slider = Slider(
+            100, 250, 200, 0.0, 1.0, settings.get("death_volume"), "Death Volume"
+        )
+        self.difficulty_slider = Slider(
+            100, 300, 200, 0.5, 3.0, settings.get("difficulty"), "Difficulty"
+        )
+        # Ползунок -> имя настройки
+        self.sliders = {
+            self.music_slider: "music_volume",
+            self.jump_slider: "jump_volume",
+            self.death_slider: "death_volume",
+            self.difficulty_slider: "difficulty",
+        }
+
+    def render(self):
         screen.fill(GREY)
         draw_bg(0)
         draw_text_with_outline(
             "Настройки", font_big, WHITE, BLACK, SCREEN_WIDTH // 2, 50, True
         )
-        music_slider.draw(screen)
-        jump_slider.draw(screen)
-        death_slider.draw(screen)
-        difficulty_slider.draw(screen)
+        for slider in self.sliders:
+            slider.draw(screen)
         draw_text_with_outline(
             f'Назад ({pygame.key.name(BINDS["back"])})',
             font_small,
@@ -583,32 +612,27 @@ def settings_menu():
             400,
             True,
         )
-        pygame.display.update()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-            music_slider.handle_event(event)
-            jump_slider.handle_event(event)
-            death_slider.handle_event(event)
-            difficulty_slider.handle_event(event)
-            if event.type == pygame.KEYDOWN:
-                if event.key == BINDS["back"]:
-                    settings = False
-    pygame.mixer.music.set_volume(music_slider.value)
-    if jump_fx:
-        jump_fx.set_volume(jump_slider.value)
-    if death_fx:
-        death_fx.set_volume(death_slider.value)
-    return difficulty_slider.value
-
-
-def game_over_screen(score, high_score):
-    game_over = True
-    if score > high_score:
-        high_score = score
-        save_high_score(high_score)
-    while game_over:
+
+    def handle_event(self, event):
+        super().handle_event(event)
+        for slider, name in self.sliders.items():
+            if slider.handle_event(event):
+                # Запись на диск отложена, пока ползунок тянут
+                settings.set(name, slider.value)
+                self.redraw = True
+        if event.type == pygame.KEYDOWN:
+            if event.key == BINDS["back"]:
+                self.manager.pop()
+
+
+class GameOverScene(Scene):
+    def __init__(self, score, difficulty):
+        super().__init__()
+        self.score = score
+        self.rank = leaderboard.submit(score, difficulty)  # запись - в фоне
+        self.high_score = leaderboard.best()
+
+    def render(self):
         screen.fill(BLACK)
         draw_bg(0)
         draw_text_with_outline(
@@ -621,7 +645,7 @@ def game_over_screen(score, high_score):
             True,
         )
         draw_text_with_outline(
-            f"SCORE: {score}",
+            f"SCORE: {self.score}",
             font_big,
             WHITE,
             BLACK,
@@ -638,20 +662,32 @@ def game_over_screen(score, high_score):
             SCREEN_HEIGHT // 2 + 50,
             True,
         )
-        pygame.display.update()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == BINDS["start"]:
-                    game_over = False
-                    main_game(high_score, 1.0)
-
-
-def pause_menu():
-    paused = True
-    while paused:
+        if self.rank is not None:
+            draw_text_with_outline(
+                f"Место в таблице рекордов: {self.rank}",
+                font_small,
+                WHITE,
+                BLACK,
+                SCREEN_WIDTH // 2,
+                SCREEN_HEIGHT // 2 + 100,
+                True,
+            )
+
+    def handle_event(self, event):
+        super().handle_event(event)
+        if event.type == pygame.KEYDOWN:
+            if event.key == BINDS["start"]:
+                self.manager.replace(
+                    GameScene(self.high_score, settings.get("difficulty"))
+                )
+
+
+class PauseScene(Scene):
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+
+    def render(self):
         screen.fill(GREY)
         draw_bg(0)
         draw_text_with_outline(
@@ -681,111 +717,128 @@ def pause_menu():
             SCREEN_HEIGHT // 2 + 30,
             True,
         )
-        pygame.display.update()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == BINDS["pause"]:  # Используем бинды вместо pygame.K_p
-                    paused = False
-                if event.key == BINDS["menu"]:  # Используем бинды вместо pygame.K_m
-                    paused = False
-                    main_menu(high_score)
-
-
-def main_game(high_score, difficulty=1.0):
-    global score
-    player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150)
-    platform_group = pygame.sprite.Group()
-    enemy_group = pygame.sprite.Group()
-    initial_platform = Platform(SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT - 50, 100, False)
-    platform_group.add(initial_platform)
-    scroll = 0
-    bg_scroll = 0
-    game_over = False
-    score = 0
-    fade_counter = 0
-    while True:
-        dt = clock.tick(FPS) / 1000
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                if score > high_score:
-                    high_score = score
-                    save_high_score(high_score)
-                pygame.quit()
-                quit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == BINDS["pause"] and not game_over:
-                    pause_menu()
-
-        if not game_over:
-            scroll = player.move(platform_group, jump_fx, difficulty)
-            player.update()
-            bg_scroll += scroll * difficulty
-            if bg_scroll >= SCREEN_HEIGHT:
-                bg_scroll = 0
-            draw_bg(bg_scroll)
-            if len(platform_group) < MAX_PLATFORMS:
-                p_w = random.randint(40, 60)
-                p_x = random.randint(0, SCREEN_WIDTH - p_w)
-                highest_platform = min(platform.rect.y for platform in platform_group)
-                p_y = highest_platform - random.randint(30, 80)
-                p_type = random.randint(1, 2)
-                p_moving = True if p_type == 1 and score > 1000 else False
-                p_destroyable = (
-                    True if random.random() < 0.25 else False
-                )  # 25% шанс сделать платформу разрушаемой
-                new_platform = Platform(
-                    p_x, p_y, p_w, p_moving, destroyable=p_destroyable, player=player
-                )
-                platform_group.add(new_platform)
-            platform_group.update(scroll * difficulty, difficulty, player)
-            if len(enemy_group) == 0 and score > 2000:
-                enemy = Enemy(
-                    SCREEN_WIDTH,
-                    random.randint(100, SCREEN_HEIGHT - 100),
-                    bird_sheet_img,
-                    1.5,
-                    speed=2 * difficulty,
-                )
-                enemy_group.add(enemy)
-            enemy_group.update(scroll * difficulty, SCREEN_WIDTH, dt, difficulty)
-            if scroll > 0:
-                score += scroll * difficulty
-            pygame.draw.line(
-                screen,
-                WHITE,
-                (0, score - high_score + SCROLL_THRESH),
-                (SCREEN_WIDTH, score - high_score + SCROLL_THRESH),
-                3,
-            )
-            draw_text_with_outline(
-                "HIGH SCORE",
-                font_small,
-                WHITE,
-                BLACK,
-                SCREEN_WIDTH - 130,
-                score - high_score + SCROLL_THRESH,
-                False,
-            )
-            platform_group.draw(screen)
-            enemy_group.draw(screen)
-            player.draw()
-            draw_panel()
-            if player.rect.top > SCREEN_HEIGHT:
-                game_over = True
-                death_fx.play()
-            if pygame.sprite.spritecollide(
-                player, enemy_group, False, pygame.sprite.collide_mask
-            ):
-                game_over = True
-                death_fx.play()
+
+    def handle_event(self, event):
+        super().handle_event(event)
+        if event.type == pygame.KEYDOWN:
+            if event.key == BINDS["pause"]:  # Используем бинды вместо pygame.K_p
+                self.manager.pop()
+            elif event.key == BINDS["menu"]:  # Используем бинды вместо pygame.K_m
+                self.manager.reset(MainMenuScene())
+
+
+class GameScene(Scene):
+    idle = False
+
+    def __init__(self, high_score, difficulty=1.0, replay=None):
+        super().__init__()
+        self.high_score = high_score
+        self.replay = replay  # replay.Recording: ввод берётся из записи
+        if replay is None:
+            self.world = World(player_frames, bird_frames, high_score, difficulty)
+            self.recorder = InputRecorder(self.world)
+            self.replay_inputs = None
         else:
-            game_over_screen(score, high_score)
-        pygame.display.update()
+            self.world = replay.new_world(World, player_frames, bird_frames)
+            self.recorder = None
+            self.replay_inputs = replay.inputs()
+        self.accumulator = 0.0
+        self.resume()
+
+    def resume(self):
+        clock.tick()  # время в паузе и меню не догоняем
+        self.accumulator = 0.0
+        renderer.invalidate()
+
+    def save_replay(self):
+        if self.recorder is not None and REPLAY_PATH is not None:
+            self.recorder.recording().save(path_gen(REPLAY_PATH), file_writer)
+
+    def on_quit(self):
+        if self.replay is not None:
+            return
+        self.save_replay()
+        leaderboard.submit(self.world.score, self.world.difficulty)
 
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == BINDS["pause"] and not self.world.game_over:
+                if self.recorder is not None:
+                    self.recorder.pause()
+                self.manager.push(PauseScene(self))
+            if event.key == pygame.K_F3:
+                if renderer.frames:
+                    print(
+                        f"Отрисовка (dirty={renderer.dirty}): "
+                        f"{renderer.total_pixels // renderer.frames} пикс./кадр"
+                    )
+                renderer.set_dirty(not renderer.dirty)
+            if event.key == pygame.K_F4:
+                # Профайлер пишет кадры, пока открыта панель
+                profiler.enabled = not profiler.enabled
+                profiler.clear()
+                renderer.invalidate()
+            if event.key == pygame.K_F5 and profiler.frames:
+                path = path_gen(TRACE_PATH)
+                count = profiler.export_trace(path)
+                print(f"Профиль кадров: {count} событий в {path}")
+            if event.key == pygame.K_F6:
+                report_memory()
+
+    def next_inputs(self, inputs):
+        if self.replay_inputs is not None:
+            return next(self.replay_inputs, None)
+        self.recorder.record(inputs)
+        return inputs
+
+    def update(self):
+        self.accumulator += clock.tick(FPS) / 1000
+        profiler.mark("wait")
+        world = self.world
+        if world.game_over:
+            if self.replay is not None:
+                self.manager.quit()
+                return
+            self.save_replay()
+            self.manager.replace(GameOverScene(world.score, world.difficulty))
+            return
+        steps = 0
+        inputs = read_inputs()
+        while self.accumulator >= TICK and steps < MAX_STEPS_PER_FRAME:
+            tick_inputs = self.next_inputs(inputs)
+            if tick_inputs is None:
+                # Запись кончилась раньше, чем игра
+                self.manager.quit()
+                return
+            for event in world.step(tick_inputs):
+                # Звуки могут ещё декодироваться - игра их не ждёт
+                if event == JUMP and jump_fx:
+                    sound_channels["jump"].play(jump_fx)
+                elif event == DEATH and death_fx:
+                    sound_channels["death"].play(death_fx)
+            self.accumulator -= TICK
+            steps += 1
+        if steps == MAX_STEPS_PER_FRAME:
+            # Слишком долгий кадр: остаток отбрасываем, а не копим отставание
+            self.accumulator = min(self.accumulator, TICK)
 
-high_score = load_high_score()
-main_menu(high_score)
-pygame.quit()
+    def draw(self):
+        if profiler.enabled:
+            renderer.invalidate()  # панель перекрывает dirty-области
+        renderer.draw(self.world, min(self.accumulator / TICK, 1.0))
+        if profiler.enabled:
+            renderer.show_canvas(profiler_overlay.draw(screen))
+            profiler.mark("overlay")
+        renderer.present()
+
+
+if __name__ == "__main__":
+    manager = SceneManager(LoadingScene(), present=present_screen)
+    manager.handlers[LOADED] = lambda event: asset_loader.poll()
+    manager.handlers[MEMORY_LOG] = log_memory
+    pygame.time.set_timer(MEMORY_LOG, MEMORY_LOG_INTERVAL)
+    manager.run()
+    leaderboard.flush(timeout=5)
+    settings.flush(timeout=5)
+    file_writer.flush(timeout=5)
+    pygame.quit()
@@ -0,0 +1,179 @@
+import json
+import os
+import time
+import tracemalloc
+import weakref
+
+from storage import append_file
+
+TOP_ALLOCATIONS = 10  # строк кода в отчёте tracemalloc
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+def rss_bytes():
+    # Текущий RSS процесса; есть только там, где есть /proc (Linux)
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class MemoryTracker:
+    """Учёт памяти игры: поверхности по владельцам, спрайты, живые объекты.
+
+    Владелец (фон, платформы, текст...) регистрируется функцией, которая
+    возвращает его поверхности на момент отчёта. Подповерхность делит пиксели
+    с родителем, поэтому считается её корневой лист, и каждый буфер пикселей
+    учитывается один раз - за первым владельцем, который его назвал. track()
+    держит слабые ссылки на объекты (миры, сцены): если после перезапусков
+    их число растёт, старые игры кто-то держит. tracemalloc включается и
+    выключается по запросу (он замедляет каждое выделение); отчёт с
+    allocations=True показывает прирост выделений с момента включения.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.live = {}  # вид -> WeakSet
+        self.owners = {}  # владелец -> функция, возвращающая поверхности
+        self.groups = {}  # имя -> функция, возвращающая группы спрайтов
+        self.baseline = None  # снимок tracemalloc при включении
+
+    def track(self, kind, obj):
+        self.live.setdefault(kind, weakref.WeakSet()).add(obj)
+
+    def objects(self, kind):
+        return list(self.live.get(kind, ()))
+
+    def add_owner(self, owner, surfaces):
+        self.owners[owner] = surfaces
+
+    def add_group(self, name, groups):
+        self.groups[name] = groups
+
+    def surfaces(self):
+        seen = set()
+        usage = {}
+        for owner, source in self.owners.items():
+            count = size = 0
+            for surface in source():
+                if surface is None:
+                    continue
+                surface = surface.get_abs_parent()
+                if id(surface) in seen:
+                    continue
+                seen.add(id(surface))
+                count += 1
+                size += surface_bytes(surface)
+            usage[owner] = {"count": count, "bytes": size}
+        return usage
+
+    def sprites(self):
+        return {
+            name: sum(len(group) for group in source())
+            for name, source in self.groups.items()
+        }
+
+    def live_counts(self):
+        return {kind: len(objects) for kind, objects in self.live.items()}
+
+    def start_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.baseline = self.take_snapshot()
+
+    def stop_tracing(self):
+        tracemalloc.stop()
+        self.baseline = None
+
+    def toggle_tracing(self):
+        if tracemalloc.is_tracing():
+            self.stop_tracing()
+        else:
+            self.start_tracing()
+        return tracemalloc.is_tracing()
+
+    def take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+
+    def allocations(self):
+        # Самые крупные места выделения памяти и прирост с включения tracemalloc
+        stats = self.take_snapshot().compare_to(self.baseline, "lineno")
+        return [
+            {
+                "where": str(stat.traceback[0]),
+                "bytes": stat.size,
+                "diff": stat.size_diff,
+                "count": stat.count,
+            }
+            for stat in stats[:TOP_ALLOCATIONS]
+        ]
+
+    def report(self, allocations=True):
+        # allocations=False - без снимка tracemalloc: он дорогой для кадра
+        report = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "uptime": round(time.time() - self.started),
+            "rss": rss_bytes(),
+            "surfaces": self.surfaces(),
+            "sprites": self.sprites(),
+            "live": self.live_counts(),
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report["python"] = {"current": current, "peak": peak}
+            if allocations and self.baseline is not None:
+                report["top"] = self.allocations()
+        return report
+
+    def write(self, path, report=None, writer=None):
+        # Одна строка JSON на отчёт: лог долгой сессии читается построчно.
+        # С writer (storage.BackgroundWriter) строка дописывается в его потоке
+        if report is None:
+            report = self.report()
+        line = (json.dumps(report) + "\n").encode()
+        if writer is None:
+            append_file(path, line)
+        else:
+            writer.append(path, line)
+        return report
+
+
+def format_report(report):
+    lines = [f"Память ({report['time']}, работает {report['uptime']} с)"]
+    if report["rss"] is not None:
+        lines.append(f"  RSS {report['rss'] / 2**20:.1f} МиБ")
+    total = sum(usage["bytes"] for usage in report["surfaces"].values())
+    lines.append(f"  поверхности {total / 2**20:.1f} МиБ:")
+    for owner, usage in report["surfaces"].items():
+        lines.append(
+            f"    {owner:<12}{usage['count']:>5} шт {usage['bytes'] / 1024:>9.0f} КиБ"
+        )
+    lines.append(
+        "  спрайты: "
+        + ", ".join(f"{name} {count}" for name, count in report["sprites"].items())
+    )
+    lines.append(
+        "  живые объекты: "
+        + ", ".join(f"{kind} {count}" for kind, count in report["live"].items())
+    )
+    if "python" in report:
+        python = report["python"]
+        lines.append(
+            f"  tracemalloc: {python['current'] / 2**20:.1f} МиБ, "
+            f"пик {python['peak'] / 2**20:.1f} МиБ"
+        )
+        for stat in report.get("top", ()):
+            lines.append(
+                f"    {stat['diff'] / 1024:>+9.1f} КиБ "
+                f"{stat['bytes'] / 1024:>9.1f} КиБ  {stat['where']}"
+            )
+    return "\n".join(lines)
+
+
+memory = MemoryTracker()
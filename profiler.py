@@ -0,0 +1,86 @@
+import json
+import os
+from collections import deque
+from time import perf_counter_ns
+
+FRAME_HISTORY = 600  # кадров в кольцевом буфере, 10 с при 60 FPS
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class FrameProfiler:
+    """Время фаз кадра в кольцевом буфере последних кадров.
+
+    Кадр открывает begin_frame(), а каждая mark(name) закрывает фазу name,
+    начавшуюся с предыдущей отметки. Пока профайлер выключен, begin_frame()
+    не открывает кадр, и mark() сразу возвращается - отметки в игровом коде
+    стоят почти ничего. Включение и выключение срабатывают со следующего кадра.
+    """
+
+    def __init__(self, capacity=FRAME_HISTORY):
+        self.enabled = False
+        self.frames = deque(maxlen=capacity)
+        self.phases = None  # фазы текущего кадра: (имя, начало, конец) в нс
+        self.frame_start = 0
+        self.last = 0
+
+    def begin_frame(self):
+        if not self.enabled:
+            self.phases = None
+            return
+        self.frame_start = self.last = perf_counter_ns()
+        self.phases = []
+
+    def mark(self, name):
+        if self.phases is None:
+            return
+        now = perf_counter_ns()
+        self.phases.append((name, self.last, now))
+        self.last = now
+
+    def end_frame(self):
+        if self.phases is None:
+            return
+        self.frames.append((self.frame_start, perf_counter_ns(), self.phases))
+        self.phases = None
+
+    def clear(self):
+        self.frames.clear()
+
+    def frame_times(self, count=None):
+        frames = list(self.frames)[-count:] if count else self.frames
+        return [(end - start) / 1e6 for start, end, _ in frames]
+
+    def phase_means(self, count=60):
+        # Среднее время каждой фазы за последние count кадров, в мс
+        frames = list(self.frames)[-count:]
+        totals = {}
+        for _, _, phases in frames:
+            for name, start, end in phases:
+                totals[name] = totals.get(name, 0) + end - start
+        return {name: total / len(frames) / 1e6 for name, total in totals.items()}
+
+    def export_trace(self, path):
+        # Формат Chrome trace: открывается в chrome://tracing и ui.perfetto.dev
+        events = []
+        for number, (start, end, phases) in enumerate(self.frames):
+            events.append(trace_event(f"frame {number}", start, end, tid=0))
+            for name, phase_start, phase_end in phases:
+                events.append(trace_event(name, phase_start, phase_end, tid=1))
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return len(events)
+
+
+def trace_event(name, start, end, tid):
+    return {
+        "name": name,
+        "ph": "X",
+        "ts": start / 1000,
+        "dur": (end - start) / 1000,
+        "pid": 1,
+        "tid": tid,
+    }
+
+
+profiler = FrameProfiler()
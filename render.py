@@ -0,0 +1,335 @@
+from collections import OrderedDict
+
+import pygame
+
+import assets
+from profiler import FRAME_BUDGET_MS, profiler
+from world import SCREEN_HEIGHT, SCREEN_WIDTH, SCROLL_THRESH
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (220, 60, 60)
+GREEN = (80, 200, 80)
+
+
+def lerp_pos(sprite, alpha):
+    x, y = sprite.rect.topleft
+    prev_x, prev_y = sprite.prev_pos
+    # Игрок, ушедший за край экрана, перескакивает - его не сглаживаем
+    if abs(x - prev_x) > SCREEN_WIDTH // 2:
+        return x, y
+    return prev_x + (x - prev_x) * alpha, prev_y + (y - prev_y) * alpha
+
+
+def render_outlined_text(text, font, color, outline_color):
+    # Обводка на 1 px собирается один раз в отдельную поверхность
+    text_surf = font.render(text, True, color)
+    outline_surf = font.render(text, True, outline_color)
+    width, height = text_surf.get_size()
+    surf = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
+    for ox in (0, 1, 2):
+        for oy in (0, 1, 2):
+            if ox != 1 or oy != 1:
+                surf.blit(outline_surf, (ox, oy))
+    surf.blit(text_surf, (1, 1))
+    return surf
+
+
+class TextCache:
+    """Готовые поверхности текста с обводкой.
+
+    Надписи лежат в LRU по ключу (текст, шрифт, цвет, цвет обводки).
+    Часто меняющиеся значения (счёт, ползунки) держатся в именованных слотах:
+    они перерисовываются только при смене текста и не вытесняют из LRU
+    надписи меню.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.slots = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, font, color, outline_color, slot=None):
+        key = (text, font, color, outline_color)
+        if slot is not None:
+            cached = self.slots.get(slot)
+            if cached is not None and cached[0] == key:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            surf = render_outlined_text(text, font, color, outline_color)
+            self.slots[slot] = (key, surf)
+            return surf
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = render_outlined_text(text, font, color, outline_color)
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surf
+
+
+text_cache = TextCache()
+
+
+def text_blit(text, font, color, outline_color, x, y, center=False, slot=None):
+    # (поверхность, позиция) надписи - для blit или копирования текстурой
+    surf = text_cache.get(text, font, color, outline_color, slot)
+    if center:
+        return surf, surf.get_rect(center=(x, y))
+    # Сам текст остаётся в (x, y), обводка выступает на 1 px
+    return surf, (x - 1, y - 1)
+
+
+def draw_text_with_outline(
+    screen, text, font, color, outline_color, x, y, center=False, slot=None
+):
+    return screen.blit(
+        *text_blit(text, font, color, outline_color, x, y, center, slot)
+    )
+
+
+class Renderer:
+    """Рисует состояние world.World, сам мир при этом не меняет.
+
+    В режиме dirty (грязные прямоугольники) фон перерисуется целиком только
+    когда он прокручивается. В остальных кадрах стираются и обновляются на
+    экране лишь области, где спрайты были в прошлом кадре и где они сейчас.
+    """
+
+    def __init__(self, screen, registry, font, dirty=False):
+        self.screen = screen
+        self.registry = registry
+        self.bg_image = registry.image("background")
+        self.font = font
+        self.dirty = dirty
+        self.bg_canvas = None  # фон, собранный под текущую прокрутку
+        self.bg_canvas_scroll = None
+        self.full_redraw = True
+        self.prev_rects = []
+        self.update_rects = None  # None - обновить весь экран
+        self.pixels_pushed = 0
+        self.total_pixels = 0
+        self.frames = 0
+
+    def invalidate(self):
+        # Экран испорчен чужой отрисовкой (меню, пауза) - нужен полный кадр
+        self.full_redraw = True
+
+    def set_dirty(self, dirty):
+        self.dirty = dirty
+        self.total_pixels = 0
+        self.frames = 0
+        self.invalidate()
+
+    def draw_bg(self, scroll):
+        self.screen.blit(self.bg_image, (0, scroll))
+        self.screen.blit(self.bg_image, (0, scroll - SCREEN_HEIGHT))
+
+    def compose_bg(self, scroll):
+        if self.bg_canvas is None:
+            self.bg_canvas = pygame.Surface(self.screen.get_size()).convert()
+        self.bg_canvas.blit(self.bg_image, (0, scroll))
+        self.bg_canvas.blit(self.bg_image, (0, scroll - SCREEN_HEIGHT))
+        self.bg_canvas_scroll = scroll
+
+    def platform_blits(self, platform_group, alpha=1.0):
+        registry = self.registry
+        return [
+            (
+                assets.platform_surface(
+                    registry, platform.rect.width, platform.is_stepped_on
+                ),
+                lerp_pos(platform, alpha),
+            )
+            for platform in platform_group
+        ]
+
+    def enemy_blits(self, enemy_group, alpha=1.0):
+        return [
+            (enemy.frames.image(enemy.current_frame), lerp_pos(enemy, alpha))
+            for enemy in enemy_group
+        ]
+
+    def player_blit(self, player, alpha=1.0):
+        return player.frames.image(0, player.flip), lerp_pos(player, alpha)
+
+    def draw_sprites(self, world, alpha=1.0):
+        # Все спрайты кадра - одним вызовом blits вместо блита на каждый
+        blits = self.platform_blits(world.platform_group, alpha)
+        blits += self.enemy_blits(world.enemy_group, alpha)
+        blits.append(self.player_blit(world.player, alpha))
+        if not self.dirty:
+            if hasattr(self.screen, "fblits"):  # есть только в pygame-ce
+                self.screen.fblits(blits)
+            else:
+                self.screen.blits(blits, doreturn=False)
+            return []
+        return self.screen.blits(blits)
+
+    def draw_panel(self, score):
+        return draw_text_with_outline(
+            self.screen,
+            "SCORE: " + str(score),
+            self.font,
+            WHITE,
+            BLACK,
+            10,
+            10,
+            slot="score",
+        )
+
+    def draw_scene(self, world, alpha):
+        line_y = world.score - world.high_score + SCROLL_THRESH
+        rects = [
+            pygame.draw.line(
+                self.screen, WHITE, (0, line_y), (SCREEN_WIDTH, line_y), 3
+            ),
+            draw_text_with_outline(
+                self.screen,
+                "HIGH SCORE",
+                self.font,
+                WHITE,
+                BLACK,
+                SCREEN_WIDTH - 130,
+                line_y,
+                False,
+            ),
+        ]
+        profiler.mark("text")
+        rects += self.draw_sprites(world, alpha)
+        profiler.mark("sprites")
+        rects.append(self.draw_panel(world.score))
+        profiler.mark("text")
+        return rects
+
+    def bg_offset(self, world, alpha):
+        # alpha - доля пройденного времени до следующего тика логики
+        bg_scroll = world.bg_scroll
+        if bg_scroll < world.prev_bg_scroll:
+            bg_scroll += SCREEN_HEIGHT
+        bg_scroll = world.prev_bg_scroll + (bg_scroll - world.prev_bg_scroll) * alpha
+        return int(bg_scroll % SCREEN_HEIGHT)
+
+    def draw(self, world, alpha=1.0):
+        bg_scroll = self.bg_offset(world, alpha)
+        if not self.dirty:
+            self.draw_bg(bg_scroll)
+            profiler.mark("bg")
+            self.draw_scene(world, alpha)
+            self.update_rects = None
+        elif self.full_redraw or bg_scroll != self.bg_canvas_scroll:
+            self.compose_bg(bg_scroll)
+            self.screen.blit(self.bg_canvas, (0, 0))
+            profiler.mark("bg")
+            self.prev_rects = self.draw_scene(world, alpha)
+            self.update_rects = None
+        else:
+            for rect in self.prev_rects:
+                self.screen.blit(self.bg_canvas, rect, rect)
+            profiler.mark("bg")
+            rects = self.draw_scene(world, alpha)
+            self.update_rects = self.prev_rects + rects
+            self.prev_rects = rects
+        self.full_redraw = False
+
+    def show_canvas(self, rect=None):
+        # Нарисованное прямо на screen (панель профайлера) уже в кадре;
+        # texture_render.TextureRenderer переносит его в текстуру
+        pass
+
+    def present(self):
+        if self.update_rects is None:
+            pygame.display.update()
+            self.pixels_pushed = self.screen.get_width() * self.screen.get_height()
+        else:
+            pygame.display.update(self.update_rects)
+            self.pixels_pushed = sum(rect.w * rect.h for rect in self.update_rects)
+        profiler.mark("display")
+        self.total_pixels += self.pixels_pushed
+        self.frames += 1
+
+
+class ProfilerOverlay:
+    """Панель поверх игры: средние времена фаз и график времени кадра.
+
+    Цифры пересчитываются раз в refresh кадров, иначе текст менялся бы каждый
+    кадр и сам съедал бы заметную часть измеряемого времени.
+    """
+
+    PHASES = (
+        "events",
+        "wait",
+        "player",
+        "spawn",
+        "platforms",
+        "enemies",
+        "update",
+        "bg",
+        "text",
+        "sprites",
+        "overlay",
+        "display",
+        "draw",
+    )
+    GRAPH_FRAMES = 120
+    GRAPH_HEIGHT = 48
+
+    def __init__(self, font, refresh=15):
+        self.font = font
+        self.refresh = refresh
+        self.frames_left = 0
+        self.lines = []
+        self.line_height = font.get_linesize()
+        width = self.GRAPH_FRAMES * 2
+        height = (len(self.PHASES) + 1) * self.line_height + self.GRAPH_HEIGHT + 12
+        self.panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 160))
+
+    def update_lines(self):
+        means = profiler.phase_means()
+        times = profiler.frame_times(60)
+        self.lines = [
+            f"frame {sum(times) / len(times):5.2f} ms, max {max(times):5.2f}"
+            if times
+            else "frame -"
+        ]
+        for name in self.PHASES:
+            self.lines.append(f"{name:<10}{means.get(name, 0.0):6.2f} ms")
+
+    def draw(self, screen):
+        if self.frames_left <= 0:
+            self.update_lines()
+            self.frames_left = self.refresh
+        self.frames_left -= 1
+        x = 4
+        y = screen.get_height() - self.panel.get_height() - 4
+        rect = screen.blit(self.panel, (x, y))
+        for i, line in enumerate(self.lines):
+            draw_text_with_outline(
+                screen,
+                line,
+                self.font,
+                WHITE,
+                BLACK,
+                x + 4,
+                y + 4 + i * self.line_height,
+                slot=("profiler", i),
+            )
+        bottom = rect.bottom - 4
+        scale = self.GRAPH_HEIGHT / (FRAME_BUDGET_MS * 2)
+        for i, ms in enumerate(profiler.frame_times(self.GRAPH_FRAMES)):
+            height = min(int(ms * scale) + 1, self.GRAPH_HEIGHT)
+            color = RED if ms > FRAME_BUDGET_MS else GREEN
+            pygame.draw.line(
+                screen, color, (x + i * 2, bottom), (x + i * 2, bottom - height)
+            )
+        budget_y = bottom - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(screen, WHITE, (x, budget_y), (rect.right, budget_y))
+        return rect
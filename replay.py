@@ -0,0 +1,192 @@
+import argparse
+import os
+import struct
+import time
+import zlib
+
+from storage import write_atomic
+from world import MAX_ENEMIES, MAX_PLATFORMS, InputState
+
+# Файл записи: заголовок с параметрами мира, дальше сжатые zlib байты ввода,
+# по одному на тик. Биты байта - нажатые клавиши.
+MAGIC = b"JMPR"
+VERSION = 2  # 2: платформы из LevelGenerator
+HEADER = struct.Struct("<4sBQddHH")
+
+LEFT = 1
+RIGHT = 2
+PAUSE = 4  # пауза нажата перед этим тиком; на симуляцию не влияет
+
+
+def pack_input(inputs, pause=False):
+    return (
+        (LEFT if inputs.move_left else 0)
+        | (RIGHT if inputs.move_right else 0)
+        | (PAUSE if pause else 0)
+    )
+
+
+def unpack_input(byte):
+    return InputState(bool(byte & LEFT), bool(byte & RIGHT))
+
+
+class Recording:
+    """Записанная игра: seed и параметры мира плюс ввод на каждом тике.
+
+    Мир, созданный через new_world() и прогнанный по inputs(), повторяет
+    исходную игру побитово - вся случайность в World идёт от seed.
+    """
+
+    def __init__(
+        self,
+        seed,
+        difficulty,
+        high_score=0,
+        max_platforms=MAX_PLATFORMS,
+        max_enemies=MAX_ENEMIES,
+        frames=b"",
+    ):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.high_score = high_score
+        self.max_platforms = max_platforms
+        self.max_enemies = max_enemies
+        self.frames = frames
+
+    def __len__(self):
+        return len(self.frames)
+
+    def inputs(self):
+        return (unpack_input(byte) for byte in self.frames)
+
+    def pauses(self):
+        return sum(1 for byte in self.frames if byte & PAUSE)
+
+    def new_world(self, world_class, player_frames, enemy_frames):
+        return world_class(
+            player_frames,
+            enemy_frames,
+            high_score=self.high_score,
+            difficulty=self.difficulty,
+            max_platforms=self.max_platforms,
+            max_enemies=self.max_enemies,
+            seed=self.seed,
+        )
+
+    def to_bytes(self):
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.seed,
+            self.difficulty,
+            self.high_score,
+            self.max_platforms,
+            self.max_enemies,
+        )
+        return header + zlib.compress(bytes(self.frames), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, *params = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("это не файл записи игры")
+        if version != VERSION:
+            raise ValueError(f"неподдерживаемая версия записи: {version}")
+        seed, difficulty, high_score, max_platforms, max_enemies = params
+        frames = zlib.decompress(data[HEADER.size :])
+        return cls(seed, difficulty, high_score, max_platforms, max_enemies, frames)
+
+    def save(self, path, writer=None):
+        # С writer (storage.BackgroundWriter) файл пишется в его потоке
+        if writer is None:
+            write_atomic(path, self.to_bytes())
+        else:
+            writer.write(path, self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+class InputRecorder:
+    # Пишет по байту на тик; пауза между тиками помечается в следующем байте
+    def __init__(self, world):
+        self.world = world
+        self.frames = bytearray()
+        self.pause_pending = False
+
+    def pause(self):
+        self.pause_pending = True
+
+    def record(self, inputs):
+        self.frames.append(pack_input(inputs, self.pause_pending))
+        self.pause_pending = False
+
+    def recording(self):
+        world = self.world
+        return Recording(
+            world.seed,
+            world.difficulty,
+            world.high_score,
+            world.max_platforms,
+            world.max_enemies,
+            bytes(self.frames),
+        )
+
+
+def play(world, recording):
+    # Прогон без окна так быстро, как получится
+    for inputs in recording.inputs():
+        if world.game_over:
+            break
+        world.step(inputs)
+    return world
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Воспроизведение записи игры")
+    parser.add_argument("path")
+    parser.add_argument(
+        "--realtime", action="store_true", help="показать в окне с обычной скоростью"
+    )
+    parser.add_argument(
+        "--arrays", action="store_true", help="запись сделана в ArrayWorld"
+    )
+    args = parser.parse_args()
+
+    recording = Recording.load(args.path)
+    print(
+        f"seed={recording.seed} difficulty={recording.difficulty} "
+        f"ticks={len(recording)} pauses={recording.pauses()} "
+        f"({os.path.getsize(args.path)} байт)"
+    )
+    if args.realtime:
+        import main as game
+        from scenes import SceneManager
+
+        game.asset_loader.wait("sprites")
+        manager = SceneManager(game.GameScene(recording.high_score, replay=recording))
+        manager.handlers[game.LOADED] = lambda event: game.asset_loader.poll()
+        manager.run()
+        game.pygame.quit()
+        return
+
+    import headless
+
+    if args.arrays:
+        from array_world import ArrayWorld as world_class
+    else:
+        from world import World as world_class
+    world = recording.new_world(world_class, *headless.load_frames())
+    start = time.perf_counter()
+    play(world, recording)
+    elapsed = time.perf_counter() - start
+    print(
+        f"score={world.score:.0f} ticks={world.ticks} game_over={world.game_over} "
+        f"за {elapsed:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import pygame
+
+from memstats import memory
+from profiler import profiler
+
+MENU_WAIT_MS = 1000
+# События, после которых меню перерисовывается; остальное время оно простаивает
+REDRAW_EVENTS = (
+    pygame.KEYDOWN,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWSIZECHANGED,
+)
+
+
+def wait_events(timeout=MENU_WAIT_MS):
+    # Меню спит до первого события и забирает всё, что накопилось за это время
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+def needs_redraw(event):
+    return event.type in REDRAW_EVENTS
+
+
+class Scene:
+    # Меню ждут событий (idle), игровая сцена крутится каждый кадр
+    idle = True
+
+    def __init__(self):
+        self.manager = None
+        self.redraw = True
+        memory.track("scene", self)
+
+    def resume(self):
+        # Сцена снова наверху стека - экран под ней испорчен
+        self.redraw = True
+
+    def handle_event(self, event):
+        if needs_redraw(event):
+            self.redraw = True
+
+    def on_quit(self):
+        pass
+
+    def update(self):
+        pass
+
+    def draw(self):
+        if self.redraw:
+            self.render()
+            self.manager.present()
+            self.redraw = False
+
+    def render(self):
+        pass
+
+
+class SceneManager:
+    """Стек сцен, которым управляет один цикл верхнего уровня.
+
+    Переходы не вызывают сцены рекурсивно: replace() и reset() выбрасывают
+    старые сцены вместе с их состоянием, а стек не растёт от перезапусков.
+    """
+
+    def __init__(self, scene=None, present=None):
+        self.stack = []
+        self.handlers = {}  # тип события -> обработчик вне сцен (загрузка и т.п.)
+        # Вывод кадра меню на экран; у окна на текстурах он свой
+        self.present = present or pygame.display.update
+        if scene is not None:
+            self.push(scene)
+
+    @property
+    def top(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        scene.manager = self
+        self.stack.append(scene)
+
+    def pop(self):
+        scene = self.stack.pop()
+        scene.manager = None
+        if self.stack:
+            self.stack[-1].resume()
+        return scene
+
+    def replace(self, scene):
+        self.stack.pop().manager = None
+        self.push(scene)
+
+    def reset(self, scene):
+        while self.stack:
+            self.stack.pop().manager = None
+        self.push(scene)
+
+    def quit(self):
+        for scene in reversed(self.stack):
+            scene.on_quit()
+        self.stack.clear()
+
+    def step(self):
+        if not self.top.idle:
+            profiler.begin_frame()  # простой меню в ожидании событий не меряем
+        events = wait_events() if self.top.idle else pygame.event.get()
+        for event in events:
+            # В текстурном режиме окон два (скрытое set_mode и окно
+            # рендерера), и крестик окна даёт только WINDOWCLOSE без QUIT
+            if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
+                self.quit()
+            elif event.type in self.handlers:
+                self.handlers[event.type](event)
+            else:
+                self.top.handle_event(event)
+            if not self.stack:
+                return False
+        profiler.mark("events")
+        self.top.update()
+        profiler.mark("update")
+        if self.stack:
+            self.top.draw()
+            profiler.mark("draw")
+        profiler.end_frame()
+        return bool(self.stack)
+
+    def run(self):
+        while self.step():
+            pass
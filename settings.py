@@ -0,0 +1,101 @@
+import json
+
+import pygame
+
+from storage import BackgroundWriter
+
+SAVE_DELAY = 0.5  # с, ползунок за это время сдвигается много раз - пишем один
+
+DEFAULT_BINDINGS = {
+    "move_left": pygame.K_a,
+    "move_right": pygame.K_d,
+    "pause": pygame.K_p,
+    "menu": pygame.K_m,
+    "start": pygame.K_RETURN,
+    "settings": pygame.K_s,
+    "quit": pygame.K_q,
+    "back": pygame.K_b,
+}
+# Управление меню биндов, на действия их назначать нельзя
+FORBIDDEN_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_BACKSPACE, pygame.K_r)
+
+DEFAULT_VALUES = {
+    "music_volume": 0.9,
+    "jump_volume": 1.0,
+    "death_volume": 1.0,
+    "difficulty": 1.0,
+}
+
+
+def read_json(path):
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except ValueError as error:
+        print(f"Файл настроек {path} повреждён ({error}), берём значения по умолчанию")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class Settings:
+    """Настройки игры в памяти: бинды, громкость и сложность.
+
+    Файлы читаются один раз при создании. Изменения сразу видны всем, кто
+    читает настройки, и рассылаются подписчикам (listener(name, value)), а на
+    диск уходят через фоновый писатель с задержкой: серия изменений подряд
+    превращается в одну запись. Бинды лежат в прежнем key_bindings.json,
+    остальное - в отдельном файле.
+    """
+
+    def __init__(self, bindings_path, values_path, writer=None):
+        self.bindings_path = bindings_path
+        self.values_path = values_path
+        self.writer = writer or BackgroundWriter(SAVE_DELAY, name="settings")
+        self.listeners = []
+        # Словарь биндов один на всю игру, rebind() меняет его на месте
+        self.bindings = dict(DEFAULT_BINDINGS)
+        for action, key in read_json(bindings_path).items():
+            if action in self.bindings and isinstance(key, int):
+                self.bindings[action] = key
+        self.values = dict(DEFAULT_VALUES)
+        for name, value in read_json(values_path).items():
+            if name in self.values and isinstance(value, (int, float)):
+                self.values[name] = value
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def notify(self, name, value):
+        for listener in self.listeners:
+            listener(name, value)
+
+    def get(self, name):
+        return self.values[name]
+
+    def set(self, name, value):
+        if self.values[name] == value:
+            return
+        self.values[name] = value
+        self.writer.write(self.values_path, json.dumps(self.values).encode())
+        self.notify(name, value)
+
+    def rebind(self, action, key):
+        if key in FORBIDDEN_KEYS:
+            print(f"Клавиша {pygame.key.name(key)} запрещена для бинда.")
+            return False
+        if key in self.bindings.values():
+            print(
+                f"Клавиша {pygame.key.name(key)} уже используется для другого действия."
+            )
+            return False
+        if action not in self.bindings:
+            return False
+        self.bindings[action] = key
+        self.writer.write(self.bindings_path, json.dumps(self.bindings).encode())
+        self.notify("bindings", self.bindings)
+        return True
+
+    def flush(self, timeout=None):
+        return self.writer.flush(timeout)
@@ -1,13 +1,56 @@
+from collections import namedtuple
+
 import pygame
 
-class SpriteSheet():
-    def __init__(self, image):
-        self.sheet = image
+# Раскладка листа: размер кадра, число кадров (None - сколько целых кадров
+# помещается на листе) и кадров в ряду (None - весь ряд листа)
+SheetLayout = namedtuple(
+    "SheetLayout", ["frame_size", "frames", "columns"], defaults=[None, None]
+)
+
+
+class SpriteSheet:
+    """Спрайт-лист и раскладка кадров на нём.
+
+    Кадры - подповерхности листа (subsurface), пиксели при нарезке не
+    копируются. Для масштаба весь лист масштабируется один раз, кадры режутся
+    уже из него, а готовый кортеж кэшируется по масштабу - все, кому нужны эти
+    кадры, получают одни и те же поверхности.
+    """
+
+    def __init__(self, sheet, layout):
+        self.sheet = sheet
+        self.layout = layout
+        self.scaled = {}  # масштаб -> кортеж кадров
+        width, height = layout.frame_size
+        self.columns = layout.columns or sheet.get_width() // width
+        self.count = layout.frames
+        if self.count is None:
+            self.count = self.columns * (sheet.get_height() // height)
+
+    def __len__(self):
+        return self.count
 
-    def get_image(self, frame, width, height, scale, colour):
-        image = pygame.Surface((width, height)).convert_alpha()
-        image.blit(self.sheet, (0, 0), ((frame * width), 0, width, height))
-        image = pygame.transform.scale(image, (int(width * scale), int(height * scale)))
-        image.set_colorkey(colour)
+    def frame_rect(self, frame, scale=1):
+        width, height = self.layout.frame_size
+        width, height = int(width * scale), int(height * scale)
+        columns = self.columns
+        return pygame.Rect(
+            frame % columns * width, frame // columns * height, width, height
+        )
 
-        return image
\ No newline at end of file
+    def frames(self, scale=1):
+        frames = self.scaled.get(scale)
+        if frames is None:
+            sheet = self.sheet
+            if scale != 1:
+                width, height = sheet.get_size()
+                sheet = pygame.transform.scale(
+                    sheet, (int(width * scale), int(height * scale))
+                )
+            frames = tuple(
+                sheet.subsurface(self.frame_rect(frame, scale))
+                for frame in range(self.count)
+            )
+            self.scaled[scale] = frames
+        return frames
@@ -0,0 +1,108 @@
+import os
+import stat
+import tempfile
+import threading
+import time
+
+# umask читается один раз при импорте: os.umask меняет его на весь процесс,
+# и из потоков писателей так делать нельзя
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def file_mode(path):
+    # mkstemp создаёт файл с правами 0600; заменяющий файл получает права
+    # прежнего, а новый - обычные 0666 с учётом umask
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~UMASK
+
+
+def write_atomic(path, data):
+    # Недописанный файл не должен заменить старый, если игру закроют посреди записи
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def append_file(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "ab") as file:
+        file.write(data)
+
+
+class BackgroundWriter:
+    """Атомарная запись файлов в фоновом потоке.
+
+    write() только запоминает последнее содержимое для пути и сразу
+    возвращается. Поток выжидает delay секунд (за это время новые write() того
+    же файла заменяют старые - пишется только последний вариант) и сохраняет
+    всё накопленное через write_atomic. append() дописывает данные в конец
+    файла (логи) без замены. flush() ждёт, пока очередь опустеет.
+    """
+
+    def __init__(self, delay=0.0, name="writer"):
+        self.delay = delay
+        self.pending = {}
+        self.appends = {}  # путь -> данные, которые надо дописать
+        self.writing = False
+        self.writes = 0  # сколько раз файлы реально записаны
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.work, name=name, daemon=True)
+        self.thread.start()
+
+    def write(self, path, data):
+        with self.condition:
+            self.pending[path] = data
+            self.condition.notify_all()
+
+    def append(self, path, data):
+        with self.condition:
+            self.appends[path] = self.appends.get(path, b"") + data
+            self.condition.notify_all()
+
+    def work(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.appends:
+                    self.condition.wait()
+            if self.delay:
+                time.sleep(self.delay)
+            with self.condition:
+                batch = self.pending
+                appends = self.appends
+                self.pending = {}
+                self.appends = {}
+                self.writing = True
+            for path, data in batch.items():
+                try:
+                    write_atomic(path, data)
+                    self.writes += 1
+                except OSError as error:
+                    print(f"Не удалось сохранить {path}: {error}")
+            for path, data in appends.items():
+                try:
+                    append_file(path, data)
+                    self.writes += 1
+                except OSError as error:
+                    print(f"Не удалось дописать {path}: {error}")
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.pending and not self.appends and not self.writing,
+                timeout,
+            )
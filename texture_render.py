@@ -0,0 +1,146 @@
+import weakref
+
+import pygame
+
+try:
+    from pygame._sdl2.video import Renderer as SDLRenderer, Texture, Window
+except ImportError:  # сборка pygame без _sdl2 - остаётся только render.Renderer
+    Window = None
+
+import render
+from profiler import profiler
+from render import BLACK, WHITE
+from world import SCREEN_HEIGHT, SCREEN_WIDTH, SCROLL_THRESH
+
+
+class TextureScreen:
+    """Окно с SDL Renderer вместо поверхности display.set_mode.
+
+    Логический размер всегда SCREEN_WIDTH x SCREEN_HEIGHT, а окно может быть
+    любым: растягивает SDL при выводе (с полосами по краям, если пропорции
+    другие), transform.scale в кадре не нужен. software=True - программный
+    рендерер SDL, он работает и без видеокарты.
+
+    Меню по-прежнему рисуются обычными функциями на canvas; present()
+    загружает canvas в потоковую текстуру и выводит её.
+    """
+
+    def __init__(self, title, size, software=False, vsync=False):
+        if Window is None:
+            raise ImportError("нужен pygame с модулем pygame._sdl2")
+        self.window = Window(title, size=size, resizable=True)
+        self.renderer = SDLRenderer(
+            self.window, accelerated=0 if software else -1, vsync=vsync
+        )
+        self.renderer.logical_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.canvas = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.canvas_texture = Texture(
+            self.renderer, self.canvas.get_size(), streaming=True
+        )
+
+    def show_canvas(self, rect=None):
+        canvas = self.canvas
+        if rect is None:
+            self.canvas_texture.update(canvas)
+            self.canvas_texture.draw()
+            return
+        # Берём полосу во всю ширину: у неё тот же шаг строк, что у canvas,
+        # а Texture.update с более узкой подповерхностью читает мимо строк
+        band = pygame.Rect(0, rect.top, canvas.get_width(), rect.height)
+        band = band.clip(canvas.get_rect())
+        self.canvas_texture.update(canvas.subsurface(band), band)
+        self.canvas_texture.draw(srcrect=rect, dstrect=rect)
+
+    def present(self):
+        self.show_canvas()
+        self.renderer.present()
+
+
+class TextureRenderer(render.Renderer):
+    """Вариант render.Renderer, собирающий кадр из текстур.
+
+    Фон, спрайты и надписи загружаются в текстуры один раз - при первом
+    появлении поверхности, дальше кадр состоит из копирований текстур.
+    Текстуры привязаны к поверхностям слабыми ссылками: когда кэш надписей
+    или вариантов спрайтов выбрасывает поверхность, уходит и её текстура.
+    Режима dirty нет - кадр всегда собирается целиком.
+    """
+
+    def __init__(self, texture_screen, registry, font):
+        super().__init__(texture_screen.canvas, registry, font)
+        self.texture_screen = texture_screen
+        self.sdl = texture_screen.renderer
+        self.textures = weakref.WeakKeyDictionary()
+        self.uploads = 0
+        self.bg_texture = self.texture(self.bg_image)
+
+    def texture(self, surface):
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = Texture.from_surface(self.sdl, surface)
+            self.textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def copy(self, surface, pos):
+        texture = self.texture(surface)
+        x, y = pos[0], pos[1]
+        texture.draw(dstrect=(x, y, texture.width, texture.height))
+
+    def set_dirty(self, dirty):
+        super().set_dirty(False)
+
+    def draw_sprites(self, world, alpha=1.0):
+        blits = self.platform_blits(world.platform_group, alpha)
+        blits += self.enemy_blits(world.enemy_group, alpha)
+        blits.append(self.player_blit(world.player, alpha))
+        for image, pos in blits:
+            self.copy(image, pos)
+
+    def draw_scene(self, world, alpha):
+        line_y = int(world.score - world.high_score + SCROLL_THRESH)
+        # Как pygame.draw.line толщиной 3: строки line_y - 1 .. line_y + 1
+        self.sdl.draw_color = WHITE + (255,)
+        self.sdl.fill_rect((0, line_y - 1, SCREEN_WIDTH, 3))
+        self.copy(
+            *render.text_blit(
+                "HIGH SCORE", self.font, WHITE, BLACK, SCREEN_WIDTH - 130, line_y
+            )
+        )
+        profiler.mark("text")
+        self.draw_sprites(world, alpha)
+        profiler.mark("sprites")
+        self.copy(
+            *render.text_blit(
+                "SCORE: " + str(world.score),
+                self.font,
+                WHITE,
+                BLACK,
+                10,
+                10,
+                slot="score",
+            )
+        )
+        profiler.mark("text")
+
+    def draw(self, world, alpha=1.0):
+        bg_scroll = self.bg_offset(world, alpha)
+        self.sdl.draw_color = BLACK + (255,)
+        self.sdl.clear()  # полосы вокруг кадра, если пропорции окна другие
+        self.bg_texture.draw(dstrect=(0, bg_scroll, SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.bg_texture.draw(
+            dstrect=(0, bg_scroll - SCREEN_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT)
+        )
+        profiler.mark("bg")
+        self.draw_scene(world, alpha)
+        self.update_rects = None
+
+    def show_canvas(self, rect=None):
+        self.texture_screen.show_canvas(rect)
+
+    def present(self):
+        self.sdl.present()
+        profiler.mark("display")
+        self.pixels_pushed = SCREEN_WIDTH * SCREEN_HEIGHT
+        self.total_pixels += self.pixels_pushed
+        self.frames += 1
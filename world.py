@@ -0,0 +1,594 @@
+import queue
+import random
+import sys
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+from functools import lru_cache
+
+import pygame
+
+from memstats import memory
+from profiler import profiler
+
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 600
+SCROLL_THRESH = 200
+GRAVITY = 1
+JUMP_SPEED = 20  # скорость отскока от платформы вверх
+MAX_PLATFORMS = 10
+
+# Логика идёт фиксированными тиками независимо от частоты кадров.
+# Вся физика (GRAVITY, прыжок -20, скорости) подобрана под 60 тиков в секунду.
+TICK_RATE = 60
+TICK = 1 / TICK_RATE
+MAX_STEPS_PER_FRAME = 5  # сколько тиков можно догнать за один кадр
+
+PLAYER_SIZE = 45
+PLATFORM_HEIGHT = 10
+PLATFORM_WIDTHS = (40, 60)
+PLATFORM_GAPS = (30, 80)  # расстояние по вертикали до следующей платформы
+CHUNK_HEIGHT = SCREEN_HEIGHT  # высота уровня, которую генератор строит за раз
+CHUNKS_AHEAD = 2
+PLACEMENT_TRIES = 8
+
+ENEMY_SCORE = 2000  # после этого счёта появляются птицы
+SCORE_PER_ENEMY = 2500  # ещё одна птица в бюджете за столько очков (при сложности 1)
+MAX_ENEMIES = 12
+WAVE_SIZE = 4
+WAVE_INTERVAL = 90  # тиков между волнами при сложности 1
+WAVE_SPACING = 120  # расстояние по x между птицами одной волны
+ENEMY_ANIMATION_TIME = 0.1
+
+KEYED_BISECT = sys.version_info >= (3, 10)  # bisect_left(..., key=...)
+
+# События шага симуляции, на которые реагирует внешний код (звук и т.п.)
+JUMP = "jump"
+DEATH = "death"
+
+
+InputState = namedtuple("InputState", ["move_left", "move_right"])
+NO_INPUT = InputState(False, False)
+
+
+class Player(pygame.sprite.Sprite):
+    def __init__(self, x, y, frames):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, PLAYER_SIZE, PLAYER_SIZE)
+        self.rect.center = (x, y)
+        self.prev_pos = self.rect.topleft  # позиция до последнего тика
+        self.vel_y = 0
+        self.flip = False
+        self.frames = frames  # assets.SpriteFrames
+        self.mask = self.frames.mask(0, self.flip)
+
+    def move(self, inputs, platforms, difficulty):
+        scroll = 0
+        dx = 0
+        dy = 0
+        jumped = False
+        if inputs.move_left:
+            dx = -10 * difficulty
+            self.flip = False
+        if inputs.move_right:
+            dx = 10 * difficulty
+            self.flip = True
+        self.vel_y += GRAVITY
+        dy += self.vel_y
+        self.rect.x += dx
+        # Экранирование игрока с противоположной стороны
+        if self.rect.right < 0:
+            self.rect.left = SCREEN_WIDTH
+        elif self.rect.left > SCREEN_WIDTH:
+            self.rect.right = 0
+        for platform in platforms.near(
+            self.rect.y + dy - PLATFORM_HEIGHT, self.rect.bottom + dy
+        ):
+            if platform.rect.colliderect(
+                self.rect.x, self.rect.y + dy, self.rect.width, self.rect.height
+            ):
+                if self.vel_y > 0 and self.rect.bottom < platform.rect.centery:
+                    self.rect.bottom = platform.rect.top
+                    dy = 0
+                    self.vel_y = -JUMP_SPEED
+                    jumped = True
+        if self.rect.top <= SCROLL_THRESH and self.vel_y < 0:
+            scroll = -dy
+        self.rect.y += dy + scroll
+        return scroll, jumped
+
+    def update(self):
+        self.mask = self.frames.mask(0, self.flip)
+
+
+def sprite_y(sprite):
+    return sprite.rect.y
+
+
+class PlatformPool:
+    """Платформы, убранные из игры, ждут здесь следующего спавна.
+
+    acquire() сбрасывает и возвращает свободный экземпляр, а если свободных
+    нет - создаёт новый. capacity ограничивает только число свободных
+    платформ, которые release() держит про запас; лишние отдаются сборщику.
+    """
+
+    def __init__(self, capacity=MAX_PLATFORMS * 2, rng=random):
+        self.capacity = capacity
+        self.rng = rng
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, x, y, width, moving, destroyable=False):
+        if self.free:
+            platform = self.free.pop()
+            platform.reset(x, y, width, moving, destroyable)
+            self.reused += 1
+            return platform
+        self.created += 1
+        return Platform(x, y, width, moving, destroyable, rng=self.rng)
+
+    def release(self, platform):
+        if len(self.free) < self.capacity:
+            self.free.append(platform)
+
+
+class SortedGroup(pygame.sprite.Group):
+    """Группа спрайтов с индексом, отсортированным по y (сверху вниз).
+
+    Годится для спрайтов, которые сами движутся только по горизонтали:
+    прокрутка сдвигает всех одинаково, поэтому порядок по y меняется лишь при
+    появлении и удалении спрайта - индекс обновляется в
+    add_internal/remove_internal, в том числе при kill().
+    """
+
+    def __init__(self, *sprites):
+        self.by_y = []
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        index = self.bisect(sprite.rect.y)
+        self.by_y.insert(index, sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        index = self.bisect(sprite.rect.y)
+        for i in range(index, len(self.by_y)):
+            if self.by_y[i] is sprite:
+                del self.by_y[i]
+                return
+        self.by_y.remove(sprite)
+
+    def bisect(self, y, lo=0):
+        # bisect_left по rect.y; параметр key у bisect есть только с Python 3.10
+        if KEYED_BISECT:
+            return bisect_left(self.by_y, y, lo, key=sprite_y)
+        by_y = self.by_y
+        hi = len(by_y)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if by_y[mid].rect.y < y:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def topmost(self):
+        return self.by_y[0]
+
+    def near(self, top, bottom):
+        # Спрайты с top < rect.y < bottom; снизу вверх, как раньше шёл перебор
+        start = self.bisect(top + 1)
+        end = self.bisect(bottom, start)
+        return reversed(self.by_y[start:end])
+
+
+class PlatformGroup(SortedGroup):
+    # Платформы ездят только по горизонтали, индекс по y годится для приземления
+
+    def __init__(self, *sprites, pool=None):
+        self.pool = pool  # сюда возвращаются убранные из группы платформы
+        super().__init__(*sprites)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if self.pool is not None:
+            self.pool.release(sprite)
+
+
+class EnemyGroup(SortedGroup):
+    """Птицы с индексом по y, он же broadphase для столкновений.
+
+    Птицы летят горизонтально, поэтому collide() берёт из индекса только птиц
+    в полосе высоты игрока, сверяет прямоугольники и лишь для пересёкшихся
+    проверяет Mask.overlap. Стоимость проверки не растёт с числом птиц.
+    """
+
+    def __init__(self, *sprites):
+        self.mask_checks = 0
+        super().__init__(*sprites)
+
+    def collide(self, player, height):
+        # height - высота птицы: её rect.y может быть выше игрока на height
+        rect = player.rect
+        for enemy in self.near(rect.top - height, rect.bottom):
+            if enemy.rect.colliderect(rect):
+                self.mask_checks += 1
+                offset = (enemy.rect.x - rect.x, enemy.rect.y - rect.y)
+                if player.mask.overlap(enemy.mask, offset):
+                    return enemy
+        return None
+
+
+class WaveScheduler:
+    """Когда и сколько птиц выпускать.
+
+    Бюджет - сколько птиц может быть на экране: одна после ENEMY_SCORE и ещё
+    по одной за каждые SCORE_PER_ENEMY / difficulty очков, но не больше
+    max_enemies. Когда птиц меньше бюджета и прошло WAVE_INTERVAL / difficulty
+    тиков с прошлой волны, вылетает волна до WAVE_SIZE птиц, каждая на своей
+    высоте и на WAVE_SPACING правее предыдущей.
+    """
+
+    def __init__(self, rng, difficulty, max_enemies):
+        self.rng = rng
+        self.difficulty = difficulty
+        self.max_enemies = max_enemies
+        self.cooldown = 0
+        self.waves = 0
+
+    def budget(self, score):
+        if score <= ENEMY_SCORE:
+            return 0
+        extra = int((score - ENEMY_SCORE) * self.difficulty / SCORE_PER_ENEMY)
+        return min(self.max_enemies, 1 + extra)
+
+    def next_wave(self, score, alive):
+        # Центры новых птиц на этот тик, обычно пусто
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return ()
+        count = min(self.budget(score) - alive, WAVE_SIZE)
+        if count <= 0:
+            return ()
+        self.cooldown = int(WAVE_INTERVAL / self.difficulty)
+        self.waves += 1
+        return [
+            (
+                SCREEN_WIDTH + i * WAVE_SPACING,
+                self.rng.randint(100, SCREEN_HEIGHT - 100),
+            )
+            for i in range(count)
+        ]
+
+
+@lru_cache(maxsize=None)
+def jump_reach(gap, difficulty):
+    """Сколько пикселей по горизонтали игрок успевает пролететь после отскока,
+    прежде чем опустится ниже платформы, лежащей на gap выше. None - не
+    допрыгнуть вовсе.
+
+    Пока игрок у верхнего края, он стоит на месте, а платформы едут вниз на
+    scroll * difficulty, поэтому при difficulty < 1 подъём соответственно ниже.
+    """
+    rise = min(difficulty, 1.0)
+    vel_y = -JUMP_SPEED
+    height = peak = 0.0
+    ticks = 0
+    while vel_y < 0 or height >= gap:
+        vel_y += GRAVITY
+        height -= vel_y * rise
+        peak = max(peak, height)
+        ticks += 1
+    if peak < gap:
+        return None
+    return (ticks - 1) * 10 * difficulty
+
+
+def horizontal_gap(x1, width1, x2, width2):
+    # Сколько лететь вбок от платформы 1 до платформы 2; игрок, ушедший за край
+    # экрана, появляется с другой стороны, поэтому смотрим и сдвинутые копии
+    period = SCREEN_WIDTH + PLAYER_SIZE
+    best = period
+    for shift in (-period, 0, period):
+        left = x2 + shift
+        best = min(
+            best,
+            max(0, left - PLAYER_SIZE - (x1 + width1), x1 - PLAYER_SIZE - (left + width2)),
+        )
+    return best
+
+
+class ChunkWorker:
+    """Фоновый поток, который строит куски уровня для всех LevelGenerator.
+
+    Поток один на процесс и запускается при первой задаче: брошенные игры
+    (рестарты, сброс сред) не оставляют после себя висящих потоков.
+    """
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, generator):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.work, name="level", daemon=True
+                )
+                self.thread.start()
+        self.jobs.put(generator)
+
+    def work(self):
+        while True:
+            generator = self.jobs.get()
+            try:
+                chunk = generator.make_chunk()
+            except Exception as error:
+                # Ошибку отдаём вместо куска: её поднимет next_platform() в
+                # основном потоке, иначе игра навсегда повиснет на ready.get()
+                chunk = error
+            generator.ready.put(chunk)
+
+
+chunk_worker = ChunkWorker()
+
+
+class LevelGenerator:
+    """Раскладка платформ, построенная заранее кусками по CHUNK_HEIGHT.
+
+    Каждая платформа проверяется на досягаемость с предыдущей по дуге прыжка
+    (jump_reach) при данной сложности. Первый кусок строится сразу, следующие -
+    в chunk_worker, который держит CHUNKS_AHEAD кусков наготове, так что
+    next_platform() в кадре только берёт готовую запись из очереди.
+
+    Свой rng выводится из seed игры, а куски строятся строго по порядку,
+    поэтому раскладка не зависит от того, когда поток успел их сделать.
+    """
+
+    def __init__(self, seed, difficulty, start, ahead=CHUNKS_AHEAD, worker=None):
+        self.rng = random.Random(f"level:{seed}")
+        self.difficulty = difficulty
+        self.last_x, self.last_width = start  # последняя выданная раскладкой
+        self.max_gap = PLATFORM_GAPS[0]
+        for gap in range(PLATFORM_GAPS[0], PLATFORM_GAPS[1] + 1):
+            if jump_reach(gap, difficulty) is not None:
+                self.max_gap = gap
+        self.ready = queue.Queue()
+        self.worker = worker or chunk_worker
+        self.waits = 0  # сколько раз кадру пришлось ждать поток
+        self.moved = 0  # сколько платформ пришлось подвинуть под досягаемость
+        self.chunk = iter(self.make_chunk())
+        for _ in range(ahead):
+            self.worker.submit(self)
+
+    def place(self, width, gap):
+        rng = self.rng
+        reach = jump_reach(gap, self.difficulty)
+        for _ in range(PLACEMENT_TRIES):
+            x = rng.randint(0, SCREEN_WIDTH - width)
+            if horizontal_gap(self.last_x, self.last_width, x, width) <= reach:
+                return x
+        # Не повезло - ставим прямо над предыдущей
+        self.moved += 1
+        x = self.last_x + (self.last_width - width) // 2
+        return max(0, min(x, SCREEN_WIDTH - width))
+
+    def make_chunk(self):
+        # (x, ширина, зазор по y, может ли двигаться, разрушаемая)
+        rng = self.rng
+        chunk = []
+        height = 0
+        while height < CHUNK_HEIGHT:
+            width = rng.randint(*PLATFORM_WIDTHS)
+            gap = rng.randint(PLATFORM_GAPS[0], self.max_gap)
+            x = self.place(width, gap)
+            movable = rng.randint(1, 2) == 1
+            destroyable = rng.random() < 0.25  # 25% шанс сделать платформу разрушаемой
+            chunk.append((x, width, gap, movable, destroyable))
+            self.last_x, self.last_width = x, width
+            height += gap
+        return chunk
+
+    def next_platform(self):
+        spec = next(self.chunk, None)
+        if spec is None:
+            if self.ready.empty():
+                self.waits += 1
+            chunk = self.ready.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            self.chunk = iter(chunk)
+            self.worker.submit(self)
+            spec = next(self.chunk)
+        return spec
+
+
+class Platform(pygame.sprite.Sprite):
+    def __init__(self, x, y, width, moving, destroyable=False, rng=random):
+        super().__init__()
+        self.rng = rng  # генератор случайных чисел игры, см. World
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.generation = 0
+        self.reset(x, y, width, moving, destroyable)
+
+    def reset(self, x, y, width, moving, destroyable=False):
+        # Вызывается и при создании, и при повторном использовании из пула;
+        # generation отличает новую платформу от прежней в том же объекте
+        self.generation += 1
+        self.rect.update(x, y, width, PLATFORM_HEIGHT)
+        self.prev_pos = self.rect.topleft
+        self.moving = moving
+        self.move_counter = self.rng.randint(0, 50)
+        self.direction = self.rng.choice([-1, 1])
+        self.speed = self.rng.randint(1, 2)
+        self.destroyable = destroyable
+        self.is_stepped_on = False  # Новый атрибут для отслеживания прыжка
+
+    def update(self, scroll, difficulty, player):
+        if self.moving:
+            self.move_counter += 1
+            self.rect.x += self.direction * self.speed * difficulty
+            if (
+                self.move_counter >= 100
+                or self.rect.left < 0
+                or self.rect.right > SCREEN_WIDTH
+            ):
+                self.direction *= -1
+                self.move_counter = 0
+        self.rect.y += scroll
+        if self.rect.top > SCREEN_HEIGHT:
+            self.kill()
+
+        # Проверяем прыжок и устанавливаем платформу как "задействованную"
+        if self.destroyable and self.rect.colliderect(player.rect):
+            if not self.is_stepped_on:
+                self.is_stepped_on = True
+
+        # Разрушаем платформу с 25% шансом, если она уже использована
+        if self.is_stepped_on and not self.rect.colliderect(player.rect):
+            if self.rng.random() < 0.25:  # 25% шанс
+                self.kill()  # Уничтожаем платформу
+
+
+class Enemy(pygame.sprite.Sprite):
+    def __init__(self, x, y, frames, speed=2):
+        super().__init__()
+        self.frames = frames  # assets.SpriteFrames
+        self.current_frame = 0
+        self.mask = self.frames.mask(self.current_frame)
+        self.rect = pygame.Rect((0, 0), self.frames.size)
+        self.rect.center = (x, y)
+        self.prev_pos = self.rect.topleft
+        self.speed = speed
+        self.animation_time = ENEMY_ANIMATION_TIME
+        self.current_time = 0
+
+    def update_animation(self, dt):
+        self.current_time += dt
+        if self.current_time >= self.animation_time:
+            self.current_time = 0
+            self.current_frame = (self.current_frame + 1) % len(self.frames)
+            self.mask = self.frames.mask(self.current_frame)
+
+    def update(self, scroll, screen_width, dt, difficulty):
+        self.update_animation(dt)
+        self.rect.x -= self.speed * difficulty
+        self.rect.y += scroll
+        if self.rect.right < 0:
+            self.kill()
+
+
+class World:
+    """Состояние одной игры без отрисовки, звука и опроса клавиатуры.
+
+    step() продвигает мир на один тик длиной TICK по снимку ввода и возвращает
+    список событий (JUMP, DEATH), а отрисовкой занимается render.Renderer.
+    Все случайные числа берутся из собственного rng, созданного по seed,
+    поэтому один и тот же seed и ввод по тикам дают ту же самую игру.
+    """
+
+    def __init__(
+        self,
+        player_frames,
+        enemy_frames,
+        high_score=0,
+        difficulty=1.0,
+        max_platforms=MAX_PLATFORMS,
+        max_enemies=MAX_ENEMIES,
+        seed=None,
+    ):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        memory.track("world", self)
+        self.enemy_frames = enemy_frames
+        self.high_score = high_score
+        self.difficulty = difficulty
+        self.max_platforms = max_platforms
+        self.max_enemies = max_enemies
+        self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150, player_frames)
+        self.platform_pool = PlatformPool(max_platforms * 2, self.rng)
+        self.platform_group = PlatformGroup(pool=self.platform_pool)
+        self.enemy_group = EnemyGroup()
+        self.waves = WaveScheduler(self.rng, difficulty, max_enemies)
+        initial_platform = self.platform_pool.acquire(
+            SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT - 50, 100, False
+        )
+        self.platform_group.add(initial_platform)
+        self.level = LevelGenerator(seed, difficulty, (SCREEN_WIDTH // 2 - 50, 100))
+        self.scroll = 0
+        self.bg_scroll = 0
+        self.prev_bg_scroll = 0
+        self.score = 0
+        self.game_over = False
+        self.ticks = 0
+
+    def spawn_platform(self):
+        # Раскладка готова заранее (LevelGenerator), тут только установка
+        p_x, p_w, gap, movable, p_destroyable = self.level.next_platform()
+        p_y = self.platform_group.topmost().rect.y - gap
+        p_moving = movable and self.score > 1000
+        self.platform_group.add(
+            self.platform_pool.acquire(
+                p_x, p_y, p_w, p_moving, destroyable=p_destroyable
+            )
+        )
+
+    def spawn_enemy(self, x, y):
+        enemy = Enemy(x, y, self.enemy_frames, speed=2 * self.difficulty)
+        self.enemy_group.add(enemy)
+
+    def save_positions(self):
+        # Запоминаем положения для интерполяции между тиками при отрисовке
+        self.prev_bg_scroll = self.bg_scroll
+        self.player.prev_pos = self.player.rect.topleft
+        for sprite in self.platform_group:
+            sprite.prev_pos = sprite.rect.topleft
+        for sprite in self.enemy_group:
+            sprite.prev_pos = sprite.rect.topleft
+
+    def step(self, inputs):
+        events = []
+        if self.game_over:
+            return events
+        difficulty = self.difficulty
+        player = self.player
+        self.save_positions()
+
+        scroll, jumped = player.move(inputs, self.platform_group, difficulty)
+        if jumped:
+            events.append(JUMP)
+        player.update()
+        self.scroll = scroll
+        self.bg_scroll += scroll * difficulty
+        if self.bg_scroll >= SCREEN_HEIGHT:
+            self.bg_scroll = 0
+        profiler.mark("player")
+
+        if len(self.platform_group) < self.max_platforms:
+            self.spawn_platform()
+        profiler.mark("spawn")
+        self.platform_group.update(scroll * difficulty, difficulty, player)
+        profiler.mark("platforms")
+
+        for x, y in self.waves.next_wave(self.score, len(self.enemy_group)):
+            self.spawn_enemy(x, y)
+        self.enemy_group.update(scroll * difficulty, SCREEN_WIDTH, TICK, difficulty)
+
+        if scroll > 0:
+            self.score += scroll * difficulty
+
+        if player.rect.top > SCREEN_HEIGHT:
+            self.game_over = True
+            events.append(DEATH)
+        if self.enemy_group.collide(player, self.enemy_frames.size[1]):
+            self.game_over = True
+            events.append(DEATH)
+        profiler.mark("enemies")
+        self.ticks += 1
+        return events